@@ -0,0 +1,181 @@
+import { writable } from 'svelte/store';
+import { base } from '$app/paths';
+
+// Number of hot particle records prefetched during warm-up
+const WARM_UP_COUNT = 8;
+
+const MANIFEST = 'manifest.json';
+const KEYS = 'keys.json';
+
+const cache = new Map();
+
+// Paths fetched by the warm-up that no visit has shown yet
+const prefetched = new Set();
+
+function dataURL(path, params) {
+  const query = params.toString();
+  return `${base}/particles/${path}${query ? `?${query}` : ''}`;
+}
+
+// Every file is requested with a short hash of its content, so caches keep it
+// until that file changes. The manifest is always revalidated and holds the
+// key of keys.json, which holds the keys of all other files.
+async function cacheKeyParams(path) {
+  const params = new URLSearchParams();
+  let key;
+  if (path === KEYS) key = (await fetchJSON(MANIFEST)).keys;
+  else if (path !== MANIFEST) key = (await fetchJSON(KEYS))[path];
+  if (key) params.set('h', key);
+  return params;
+}
+
+// Fetch a file from the particle dataset once and share it between callers.
+// Prefetches are tagged so usage-log ranking can tell them from visits.
+function fetchJSON(path, { prefetch = false } = {}) {
+  if (!cache.has(path)) {
+    if (prefetch) prefetched.add(path);
+    const request = (async () => {
+      const params = await cacheKeyParams(path);
+      if (prefetch) params.set('prefetch', '1');
+      const response = await fetch(
+        dataURL(path, params),
+        path === MANIFEST ? { cache: 'no-cache' } : {}
+      );
+      if (!response.ok) {
+        const error = new Error(`Failed to load ${path}`);
+        error.status = response.status;
+        throw error;
+      }
+      return response.json();
+    })();
+    // Don't keep failed requests around so they can be retried
+    request.catch(() => {
+      cache.delete(path);
+      prefetched.delete(path);
+    });
+    cache.set(path, request);
+  }
+  return cache.get(path);
+}
+
+// A prefetched record shown to the user never reaches the server again, so
+// report the visit with an untagged request that the usage logs count
+async function reportVisit(path) {
+  try {
+    await fetch(dataURL(path, await cacheKeyParams(path)), {
+      method: 'HEAD',
+      cache: 'no-store',
+      keepalive: true
+    });
+  } catch {
+    // Losing a beacon only costs one hit in the popularity ranking
+  }
+}
+
+export const loadManifest = () => fetchJSON(MANIFEST);
+export const loadPopular = () => fetchJSON('popular.json').then((data) => data.particles);
+export const loadNameMapping = () => fetchJSON('name-mapping.json');
+
+export function loadParticle(pdgId) {
+  const path = `${pdgId}.json`;
+  const request = fetchJSON(path);
+  if (prefetched.delete(path)) reportVisit(path);
+  return request;
+}
+
+// `ready` turns true once the name mapping used by search is loaded
+export const dataStatus = writable({ ready: false, error: null });
+
+let warmUpRequest = null;
+
+async function prefetchHot() {
+  try {
+    const [manifest, popular] = await Promise.all([loadManifest(), loadPopular()]);
+    const hot = manifest.warm_up ?? popular.map((particle) => particle.pdgid);
+    await Promise.allSettled(
+      hot.slice(0, WARM_UP_COUNT).map((pdgId) => fetchJSON(`${pdgId}.json`, { prefetch: true }))
+    );
+  } catch (err) {
+    console.error('Failed to prefetch particle data:', err);
+  }
+}
+
+export function warmUp() {
+  if (!warmUpRequest) {
+    warmUpRequest = (async () => {
+      // Hot records load in the background; search only needs the name mapping
+      prefetchHot();
+      try {
+        await loadNameMapping();
+        dataStatus.set({ ready: true, error: null });
+      } catch (err) {
+        console.error('Failed to warm up particle data:', err);
+        warmUpRequest = null;
+        dataStatus.set({ ready: false, error: err.message });
+      }
+    })();
+  }
+  return warmUpRequest;
+}
+
+export const loadQuantumIndex = () => fetchJSON('quantum-index.json');
+
+function decodeBitset(encoded) {
+  return Uint8Array.from(atob(encoded), (char) => char.charCodeAt(0));
+}
+
+// Find PDG IDs having all given properties, e.g. ['is_meson', 'has_bottom', 'J=1']
+export async function findParticles(properties) {
+  const index = await loadQuantumIndex();
+  let mask = null;
+  for (const key of properties) {
+    const encoded = index.properties[key];
+    if (encoded === undefined) return [];
+    const bits = decodeBitset(encoded);
+    if (mask === null) {
+      mask = bits;
+    } else {
+      for (let i = 0; i < mask.length; i++) mask[i] &= bits[i];
+    }
+  }
+  if (mask === null) return index.pdgids;
+  return index.pdgids.filter((_, i) => mask[i >> 3] & (1 << (i & 7)));
+}
+
+// Default number of PDG IDs returned by searchNames
+const SEARCH_LIMIT = 20;
+
+function rankMatches(nameMapping, query) {
+  const best = new Map();
+  for (const [key, pdgIds] of Object.entries(nameMapping)) {
+    let rank;
+    if (key === query) rank = 0;
+    else if (key.startsWith(query)) rank = 1;
+    else if (key.includes(query)) rank = 2;
+    else if (query.includes(key)) rank = 3;
+    else continue;
+    // Closer names first; for partial names, the one covering more of the query
+    const length = rank === 3 ? -key.length : key.length;
+    for (const pdgId of pdgIds) {
+      const previous = best.get(pdgId);
+      if (!previous || rank < previous.rank || (rank === previous.rank && length < previous.length)) {
+        best.set(pdgId, { rank, length });
+      }
+    }
+  }
+  // Ties are broken by |pdgid|, particle before antiparticle, so results are stable
+  return [...best.entries()]
+    .sort(([a, x], [b, y]) =>
+      x.rank - y.rank || x.length - y.length || Math.abs(a) - Math.abs(b) || b - a
+    )
+    .map(([pdgId]) => pdgId);
+}
+
+// Search particle names, returning the best-ranked PDG IDs and the match count
+export async function searchNames(query, { limit = SEARCH_LIMIT } = {}) {
+  const normalized = query.toLowerCase().trim();
+  if (!normalized) return { pdgIds: [], total: 0 };
+
+  const results = rankMatches(await loadNameMapping(), normalized);
+  return { pdgIds: results.slice(0, Math.max(limit, 1)), total: results.length };
+}
@@ -1,3 +1,3 @@
 export const prerender = true;
 export const ssr = false;
-export const csr = true;
\ No newline at end of file
+export const csr = true;
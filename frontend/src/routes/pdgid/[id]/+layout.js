@@ -1 +1 @@
-export const prerender = false;
\ No newline at end of file
+export const prerender = false;
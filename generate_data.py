@@ -11,31 +11,188 @@ Generate static data files for the particle explorer SPA.
 This script extracts particle data from the particle package and generates:
 1. Individual JSON files for each particle (by PDG ID)
 2. A name mapping file for search functionality
-3. A popular particles file
+3. A popular particles file, optionally ranked from recorded usage logs
+4. A quantum-number index of decoded PDG ID properties stored as bitsets
+5. A columnar binary particle table for bulk PDG ID translation
+6. Content hashes of all files and deltas against previous dataset versions
+7. A manifest, written last, marking the dataset as complete
+
+Each run writes into a new directory under frontend/particle-data/ and then
+atomically repoints the frontend/static/particles symlink at it, so the
+served dataset is always complete and consistent.
 
 Output structure:
 - frontend/static/particles/{pdgid}.json - Individual particle data
 - frontend/static/particles/name-mapping.json - Search mapping
 - frontend/static/particles/popular.json - Popular particles list
+- frontend/static/particles/quantum-index.json - Quantum-number bitsets
+- frontend/static/particles/table/ - Little-endian columns sorted by pdgid
+- frontend/static/particles/files.json - SHA-256 of every data file
+- frontend/static/particles/deltas/{version}.json - Changes since {version}
+- frontend/static/particles/manifest.json - Dataset summary and warm-up list
 """
 
+import argparse
+import base64
+import cProfile
+import gzip
+import hashlib
+import io
 import json
 import logging
 import math
+import os
+import pstats
+import queue
+import re
+import shutil
+import threading
+import time
+import urllib.request
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any
+from urllib.parse import urljoin
 
+import particle as particle_package
+import particle.pdgid as pdgid_functions
 from particle import Particle
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from particle_table import CompactRecords, write_particle_table
+
 logger = logging.getLogger(__name__)
 
-# Output directory
+# Output directory, published as a symlink to the current version directory
 OUTPUT_DIR = Path(__file__).parent / "frontend" / "static" / "particles"
 
+# Versioned datasets, kept outside frontend/static so only the published one ships
+VERSIONS_DIR = Path(__file__).parent / "frontend" / "particle-data"
+
+# Published versions kept around (the newest is the one OUTPUT_DIR points at)
+KEEP_VERSIONS = 3
+
+# Encoded files buffered between the encoding and writing stages
+WRITE_QUEUE_SIZE = 64
+
+# Files between progress log messages
+PROGRESS_INTERVAL = 1000
+
+# Curated popular particles, used when no usage data is available and to
+# fill up the list when fewer particles have been recorded
+POPULAR_PDGIDS = [
+    11,  # electron
+    -11,  # positron
+    13,  # muon
+    -13,  # anti-muon
+    22,  # photon
+    25,  # Higgs boson
+    111,  # neutral pion
+    211,  # charged pion
+    -211,  # negative pion
+    2212,  # proton
+    -2212,  # anti-proton
+    2112,  # neutron
+    -2112,  # anti-neutron
+    1,  # down quark
+    2,  # up quark
+    3,  # strange quark
+    4,  # charm quark
+    5,  # bottom quark
+    6,  # top quark
+]
+
+# Boolean PDG ID properties decoded into the quantum-number index
+QUANTUM_FLAGS = [
+    "is_lepton",
+    "is_quark",
+    "is_hadron",
+    "is_meson",
+    "is_baryon",
+    "is_pentaquark",
+    "is_diquark",
+    "is_nucleus",
+    "is_gauge_boson_or_higgs",
+    "is_sm_gauge_boson_or_higgs",
+    "is_SUSY",
+    "has_down",
+    "has_up",
+    "has_strange",
+    "has_charm",
+    "has_bottom",
+    "has_top",
+    "has_fundamental_anti",
+]
+
+# Valued PDG ID properties, indexed as "<name>=<value>" (e.g. "J=1/2")
+QUANTUM_VALUES = ["J", "L", "S", "three_charge"]
+
+# Decimal digits of the PDG ID numbering scheme, counted from the right
+PDGID_DIGITS = {"n": 7, "n_r": 6, "n_L": 5}
+
+# PDG IDs per work item when building particle records in worker processes
+RECORD_CHUNK_SIZE = 256
+
+# Functions listed in the log summary of a --profile run
+PROFILE_SUMMARY_LINES = 25
+
+# Number of hot particle records clients prefetch during warm-up
+WARM_UP_COUNT = 8
+
+# Particle record fetches in access logs, e.g. "GET /particles/2212.json"
+PARTICLE_HIT_PATTERN = re.compile(r"/particles/(-?\d+)\.json(?:\?(\S*))?")
+
+# Query parameter tagging client warm-up prefetches, which aren't user hits
+PREFETCH_PARAM = "prefetch=1"
+
+
+class PopularityTracker:
+    """Exact hit counts per PDG ID, ranked most hits first.
+
+    Logs are read offline at build time and there are only a few thousand
+    PDG IDs, so exact counts are cheap and give exact ranks.
+    """
+
+    def __init__(self) -> None:
+        self.counts: Counter[int] = Counter()
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def record(self, pdgid: int, count: int = 1) -> None:
+        """Record ``count`` hits for a PDG ID."""
+        self.counts[pdgid] += count
+
+    def most_common(self, n: int | None = None) -> list[tuple[int, int]]:
+        """Return up to ``n`` (pdgid, hits) pairs, most hits first, ties by PDG ID."""
+        ranked = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+        return ranked if n is None else ranked[:n]
 
-def safe_float(value: Any) -> Optional[float]:
+
+def load_usage_logs(paths: Iterable[Path], tracker: PopularityTracker) -> int:
+    """Record particle fetches from access logs (plain or gzipped) into the tracker."""
+    hits = 0
+    for path in paths:
+        opener = gzip.open if path.suffix == ".gz" else open
+        try:
+            with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    match = PARTICLE_HIT_PATTERN.search(line)
+                    if match and PREFETCH_PARAM not in (match.group(2) or "").split(
+                        "&"
+                    ):
+                        tracker.record(int(match.group(1)))
+                        hits += 1
+        except OSError as e:
+            logger.warning(f"Failed to read usage log {path}: {e}")
+            continue
+    return hits
+
+
+def safe_float(value: Any) -> float | None:
     """Convert value to float, handling special cases."""
     if value is None:
         return None
@@ -56,31 +213,28 @@ def get_descriptive_name(particle: Particle) -> str:
     descriptive_names = {
         # Leptons
         11: "electron",
-        -11: "positron", 
+        -11: "positron",
         13: "muon",
         -13: "antimuon",
         15: "tau lepton",
         -15: "tau antilepton",
         12: "electron neutrino",
         -12: "electron antineutrino",
-        14: "muon neutrino", 
+        14: "muon neutrino",
         -14: "muon antineutrino",
         16: "tau neutrino",
         -16: "tau antineutrino",
-        
         # Gauge bosons
         22: "photon",
         23: "Z boson",
         24: "W+ boson",
         -24: "W- boson",
         25: "Higgs boson",
-        
         # Baryons
         2212: "proton",
         -2212: "antiproton",
         2112: "neutron",
         -2112: "antineutron",
-        
         # Mesons
         211: "charged pion",
         -211: "charged pion",
@@ -90,11 +244,10 @@ def get_descriptive_name(particle: Particle) -> str:
         311: "neutral kaon",
         130: "neutral kaon (long)",
         310: "neutral kaon (short)",
-        
         # Quarks
         1: "down quark",
         -1: "anti-down quark",
-        2: "up quark", 
+        2: "up quark",
         -2: "anti-up quark",
         3: "strange quark",
         -3: "anti-strange quark",
@@ -108,7 +261,7 @@ def get_descriptive_name(particle: Particle) -> str:
     return descriptive_names.get(pdgid, particle.name)
 
 
-def create_particle_data(particle: Particle) -> Dict[str, Any]:
+def create_particle_data(particle: Particle) -> dict[str, Any]:
     """Create particle data dictionary."""
     try:
         anti_particle = particle.invert()
@@ -116,7 +269,7 @@ def create_particle_data(particle: Particle) -> Dict[str, Any]:
     except Exception:
         has_antiparticle = False
         anti_particle = None
-    
+
     return {
         "pdgid": int(particle.pdgid),
         "name": particle.name,
@@ -136,90 +289,147 @@ def create_particle_data(particle: Particle) -> Dict[str, Any]:
         "g_parity": getattr(particle, "G", None),
         "anti_particle_pdgid": int(anti_particle.pdgid) if has_antiparticle else None,
         "anti_particle_name": anti_particle.name if has_antiparticle else None,
-        "status": str(particle.status) if hasattr(particle, "status") and particle.status is not None else None,
-        "lifetime": safe_float(particle.lifetime / 1e9) if particle.lifetime is not None and particle.lifetime != 0 else safe_float(particle.lifetime),  # Convert ns to s
+        "status": str(particle.status)
+        if hasattr(particle, "status") and particle.status is not None
+        else None,
+        "lifetime": safe_float(particle.lifetime / 1e9)
+        if particle.lifetime is not None and particle.lifetime != 0
+        else safe_float(particle.lifetime),  # Convert ns to s
         "ctau": safe_float(getattr(particle, "ctau", None)),
     }
 
 
-def build_name_mapping() -> Dict[str, List[int]]:
+def _create_particle_records(
+    pdgids: list[int],
+) -> list[tuple[int, dict[str, Any] | None, str | None]]:
+    """Build records for a chunk of PDG IDs, returning (pdgid, record, error) tuples."""
+    results = []
+    for pdgid in pdgids:
+        try:
+            results.append(
+                (pdgid, create_particle_data(Particle.from_pdgid(pdgid)), None)
+            )
+        except Exception as e:
+            results.append((pdgid, None, str(e)))
+    return results
+
+
+def iter_particle_records(
+    particles: Iterable[Particle],
+    workers: int = 1,
+    chunk_size: int = RECORD_CHUNK_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """Yield particle records in input order, building them in worker processes.
+
+    With more than one worker, chunks are dispatched to a process pool with at
+    most ``2 * workers`` chunks in flight, so a slow consumer throttles
+    submission instead of finished records piling up in memory.
+    """
+    pdgids = [int(p.pdgid) for p in particles]
+    chunks = [pdgids[i : i + chunk_size] for i in range(0, len(pdgids), chunk_size)]
+
+    def unpack(results):
+        for pdgid, record, error in results:
+            if record is None:
+                logger.warning(
+                    f"Failed to generate record for particle {pdgid}: {error}"
+                )
+                continue
+            yield record
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from unpack(_create_particle_records(chunk))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            if len(pending) >= 2 * workers:
+                yield from unpack(pending.popleft().result())
+            pending.append(pool.submit(_create_particle_records, chunk))
+        while pending:
+            yield from unpack(pending.popleft().result())
+
+
+def build_name_mapping() -> dict[str, list[int]]:
     """Build comprehensive name mapping for search functionality."""
     name_mapping = {}
-    
+
     try:
         all_particles = Particle.all()
         logger.info(f"Processing {len(all_particles)} particles for name mapping")
-        
+
         for particle in all_particles:
             try:
                 pdgid = int(particle.pdgid)
-                
+
                 # Add particle name (exact)
                 name = particle.name.lower()
                 if name not in name_mapping:
                     name_mapping[name] = []
                 if pdgid not in name_mapping[name]:
                     name_mapping[name].append(pdgid)
-                
+
                 # Add PDG name if different
-                if hasattr(particle, 'pdg_name') and particle.pdg_name.lower() != name:
+                if hasattr(particle, "pdg_name") and particle.pdg_name.lower() != name:
                     pdg_name = particle.pdg_name.lower()
                     if pdg_name not in name_mapping:
                         name_mapping[pdg_name] = []
                     if pdgid not in name_mapping[pdg_name]:
                         name_mapping[pdg_name].append(pdgid)
-                
+
                 # Add common aliases based on PDG ID
                 aliases = []
                 if pdgid == 11:
-                    aliases = ['electron']
+                    aliases = ["electron"]
                 elif pdgid == -11:
-                    aliases = ['positron']
+                    aliases = ["positron"]
                 elif pdgid == 13:
-                    aliases = ['muon']
+                    aliases = ["muon"]
                 elif pdgid == -13:
-                    aliases = ['antimuon']
+                    aliases = ["antimuon"]
                 elif pdgid == 2212:
-                    aliases = ['proton']
+                    aliases = ["proton"]
                 elif pdgid == -2212:
-                    aliases = ['antiproton']
+                    aliases = ["antiproton"]
                 elif pdgid == 2112:
-                    aliases = ['neutron']
+                    aliases = ["neutron"]
                 elif pdgid == -2112:
-                    aliases = ['antineutron']
+                    aliases = ["antineutron"]
                 elif pdgid == 22:
-                    aliases = ['photon']
+                    aliases = ["photon"]
                 elif pdgid == 25:
-                    aliases = ['higgs', 'higgs boson']
+                    aliases = ["higgs", "higgs boson"]
                 elif pdgid == 15:
-                    aliases = ['tau']
+                    aliases = ["tau"]
                 elif pdgid == -15:
-                    aliases = ['antitau']
+                    aliases = ["antitau"]
                 elif pdgid == 1:
-                    aliases = ['down', 'down quark', 'd']
+                    aliases = ["down", "down quark", "d"]
                 elif pdgid == -1:
-                    aliases = ['anti-down', 'antidown']
+                    aliases = ["anti-down", "antidown"]
                 elif pdgid == 2:
-                    aliases = ['up', 'up quark', 'u']
+                    aliases = ["up", "up quark", "u"]
                 elif pdgid == -2:
-                    aliases = ['anti-up', 'antiup']
+                    aliases = ["anti-up", "antiup"]
                 elif pdgid == 3:
-                    aliases = ['strange', 'strange quark', 's']
+                    aliases = ["strange", "strange quark", "s"]
                 elif pdgid == -3:
-                    aliases = ['anti-strange', 'antistrange']
+                    aliases = ["anti-strange", "antistrange"]
                 elif pdgid == 4:
-                    aliases = ['charm', 'charm quark', 'c']
+                    aliases = ["charm", "charm quark", "c"]
                 elif pdgid == -4:
-                    aliases = ['anti-charm', 'anticharm']
+                    aliases = ["anti-charm", "anticharm"]
                 elif pdgid == 5:
-                    aliases = ['bottom', 'bottom quark', 'beauty', 'b']
+                    aliases = ["bottom", "bottom quark", "beauty", "b"]
                 elif pdgid == -5:
-                    aliases = ['anti-bottom', 'antibottom', 'anti-beauty']
+                    aliases = ["anti-bottom", "antibottom", "anti-beauty"]
                 elif pdgid == 6:
-                    aliases = ['top', 'top quark', 't']
+                    aliases = ["top", "top quark", "t"]
                 elif pdgid == -6:
-                    aliases = ['anti-top', 'antitop']
-                
+                    aliases = ["anti-top", "antitop"]
+
                 # Add aliases to mapping
                 for alias in aliases:
                     alias_lower = alias.lower()
@@ -227,69 +437,509 @@ def build_name_mapping() -> Dict[str, List[int]]:
                         name_mapping[alias_lower] = []
                     if pdgid not in name_mapping[alias_lower]:
                         name_mapping[alias_lower].append(pdgid)
-                        
+
             except Exception as e:
                 logger.warning(f"Failed to process particle {particle}: {e}")
                 continue
-                
+
     except Exception as e:
         logger.error(f"Failed to build name mapping: {e}")
-        
+
     logger.info(f"Built name mapping with {len(name_mapping)} entries")
     return name_mapping
 
 
-def generate_popular_particles() -> List[Dict[str, Any]]:
-    """Generate popular particles list."""
-    popular_pdgids = [
-        11,    # electron
-        -11,   # positron
-        13,    # muon
-        -13,   # anti-muon
-        22,    # photon
-        25,    # Higgs boson
-        111,   # neutral pion
-        211,   # charged pion
-        -211,  # negative pion
-        2212,  # proton
-        -2212, # anti-proton
-        2112,  # neutron
-        -2112, # anti-neutron
-        1,     # down quark
-        2,     # up quark
-        3,     # strange quark
-        4,     # charm quark
-        5,     # bottom quark
-        6,     # top quark
+def build_quantum_index(pdgids: list[int]) -> dict[str, Any]:
+    """Decode PDG IDs into per-property bitsets for quantum-number queries.
+
+    Bit ``i`` of a property's bitset is set when ``pdgids[i]`` (sorted) has the
+    property. Bitsets are little-endian and base64 encoded, so a compound
+    query is a bitwise AND of the relevant sets.
+    """
+    pdgids = sorted(pdgids)
+    masks: dict[str, int] = {}
+
+    def add(key: str, bit: int) -> None:
+        masks[key] = masks.get(key, 0) | bit
+
+    for i, pdgid in enumerate(pdgids):
+        bit = 1 << i
+        add("is_antiparticle" if pdgid < 0 else "is_particle", bit)
+        for name in QUANTUM_FLAGS:
+            try:
+                if getattr(pdgid_functions, name)(pdgid):
+                    add(name, bit)
+            except Exception:
+                continue
+        for name in QUANTUM_VALUES:
+            try:
+                value = getattr(pdgid_functions, name)(pdgid)
+            except Exception:
+                continue
+            if value is not None:
+                add(f"{name}={value}", bit)
+        if pdgid_functions.is_nucleus(pdgid):
+            # Nuclear codes (10LZZZAAAI) don't follow the n, n_r, n_L digit scheme
+            continue
+        for name, position in PDGID_DIGITS.items():
+            add(f"{name}={abs(pdgid) // 10 ** (position - 1) % 10}", bit)
+
+    size = (len(pdgids) + 7) // 8
+    properties = {
+        key: base64.b64encode(mask.to_bytes(size, "little")).decode("ascii")
+        for key, mask in sorted(masks.items())
+    }
+    return {"pdgids": pdgids, "properties": properties}
+
+
+def query_quantum_index(index: dict[str, Any], properties: Iterable[str]) -> list[int]:
+    """Return the PDG IDs having all of the given properties (e.g. ["is_meson", "J=1"])."""
+    mask = (1 << len(index["pdgids"])) - 1
+    for key in properties:
+        encoded = index["properties"].get(key)
+        if encoded is None:
+            return []
+        mask &= int.from_bytes(base64.b64decode(encoded), "little")
+    return [pdgid for i, pdgid in enumerate(index["pdgids"]) if mask >> i & 1]
+
+
+class StageStats:
+    """Item count and time spent producing items for one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+
+def metered(stats: StageStats, items: Iterable[Any]) -> Iterator[Any]:
+    """Pass items through, recording count and time spent waiting on ``items``.
+
+    Time is inclusive of upstream stages; report_stages subtracts it out.
+    """
+    iterator = iter(items)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            stats.seconds += time.perf_counter() - start
+            return
+        stats.seconds += time.perf_counter() - start
+        stats.items += 1
+        yield item
+
+
+def encode_particle_files(
+    records: Iterable[dict[str, Any]],
+    collected: Any,
+) -> Iterator[tuple[str, bytes]]:
+    """Encode particle records into (filename, content) pairs, appending each to ``collected``."""
+    for record in records:
+        collected.append(record)
+        content = json.dumps(record, indent=2, ensure_ascii=False).encode("utf-8")
+        yield f"{record['pdgid']}.json", content
+
+
+def write_files(
+    files: Iterable[tuple[str, bytes]],
+    directory: Path,
+    total: int | None = None,
+) -> StageStats:
+    """Write encoded files from a bounded queue on a background thread.
+
+    The producer blocks once WRITE_QUEUE_SIZE files are pending, so encoding
+    never runs far ahead of the disk. Progress is logged every
+    PROGRESS_INTERVAL files. Raises OSError after all files were attempted if
+    any of them failed to write.
+    """
+    stats = StageStats("write")
+    pending: queue.Queue[tuple[str, bytes] | None] = queue.Queue(
+        maxsize=WRITE_QUEUE_SIZE
+    )
+
+    def writer() -> None:
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            name, content = item
+            start = time.perf_counter()
+            try:
+                (directory / name).write_bytes(content)
+                stats.items += 1
+            except Exception as e:
+                # Keep draining the queue so the producer never blocks on a dead writer
+                stats.errors += 1
+                logger.error(f"Failed to write {name}: {e}")
+                continue
+            finally:
+                stats.seconds += time.perf_counter() - start
+            if stats.items % PROGRESS_INTERVAL == 0:
+                of_total = f"/{total}" if total is not None else ""
+                logger.info(f"Wrote {stats.items}{of_total} files")
+
+    thread = threading.Thread(target=writer, name="write-files", daemon=True)
+    thread.start()
+    try:
+        for item in files:
+            pending.put(item)
+    finally:
+        pending.put(None)
+        thread.join()
+    if stats.errors:
+        raise OSError(f"Failed to write {stats.errors} files to {directory}")
+    return stats
+
+
+def report_stages(stages: list[StageStats], writer: StageStats | None = None) -> None:
+    """Log item counts and exclusive throughput of chained pipeline stages."""
+    upstream = 0.0
+    for stage in stages:
+        own = max(stage.seconds - upstream, 0.0)
+        upstream = stage.seconds
+        rate = stage.items / own if own > 0 else float("inf")
+        logger.info(f"  {stage.name}: {stage.items} items in {own:.2f}s ({rate:.0f}/s)")
+    if writer is not None:
+        rate = writer.items / writer.seconds if writer.seconds > 0 else float("inf")
+        logger.info(
+            f"  {writer.name}: {writer.items} items in {writer.seconds:.2f}s ({rate:.0f}/s)"
+        )
+
+
+def publish_dataset(build_dir: Path, version: str) -> Path:
+    """Move a finished build into VERSIONS_DIR and atomically point OUTPUT_DIR at it.
+
+    OUTPUT_DIR is a symlink swapped with a single rename, so readers see
+    either the previous or the new dataset, never a mix.
+    """
+    version_dir = VERSIONS_DIR / version
+    try:
+        build_dir.rename(version_dir)
+    except OSError:
+        if not version_dir.is_dir():
+            raise
+        # Versions are content hashes, so this build matches a published one
+        logger.info(f"Version {version} is already published, reusing it")
+        shutil.rmtree(build_dir, ignore_errors=True)
+        os.utime(version_dir)
+
+    if OUTPUT_DIR.exists() and not OUTPUT_DIR.is_symlink():
+        # Output from before versioned publishing: move it out of the way once
+        legacy_dir = VERSIONS_DIR / f".legacy-{version}"
+        OUTPUT_DIR.rename(legacy_dir)
+        shutil.rmtree(legacy_dir, ignore_errors=True)
+
+    link = OUTPUT_DIR.with_name(f".{OUTPUT_DIR.name}.{os.getpid()}.tmp")
+    try:
+        link.unlink(missing_ok=True)
+        os.symlink(
+            os.path.relpath(version_dir, OUTPUT_DIR.parent),
+            link,
+            target_is_directory=True,
+        )
+        os.replace(link, OUTPUT_DIR)
+    except OSError as e:
+        # Symlinks may be unavailable (e.g. Windows without developer mode)
+        logger.warning(f"Symlink publish failed ({e}), copying dataset instead")
+        link.unlink(missing_ok=True)
+        if OUTPUT_DIR.is_symlink():
+            OUTPUT_DIR.unlink()
+        elif OUTPUT_DIR.exists():
+            shutil.rmtree(OUTPUT_DIR)
+        shutil.copytree(version_dir, OUTPUT_DIR)
+    return version_dir
+
+
+def published_versions() -> list[Path]:
+    """Return published version directories, least recently published first."""
+    if not VERSIONS_DIR.exists():
+        return []
+    versions = [
+        p for p in VERSIONS_DIR.iterdir() if p.is_dir() and not p.name.startswith(".")
     ]
-    
+    return sorted(versions, key=lambda p: (p.stat().st_mtime_ns, p.name))
+
+
+def prune_versions(keep: int, current: Path) -> None:
+    """Remove all but the ``keep`` newest published versions.
+
+    Neither ``current`` nor the version OUTPUT_DIR points at is removed; a
+    concurrent build may have published after ours.
+    """
+    protected = {current.resolve(), OUTPUT_DIR.resolve()}
+    for old in published_versions()[:-keep] if keep > 0 else published_versions():
+        if old.resolve() not in protected:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+# Bookkeeping files that describe a dataset version rather than being part of it
+DATASET_META_FILES = {"manifest.json", "files.json", "keys.json"}
+DELTAS_DIR_NAME = "deltas"
+
+# Hex digits of a SHA-256 used for the dataset version and per-file cache keys
+VERSION_LENGTH = 16
+CACHE_KEY_LENGTH = 8
+
+# Timeout for fetching a published files.json and manifest over HTTP
+PREVIOUS_FILES_TIMEOUT = 30
+
+
+def hash_dataset(directory: Path) -> dict[str, str]:
+    """Return SHA-256 digests of all data files, keyed by POSIX path relative to ``directory``."""
+    digests = {}
+    for path in sorted(directory.rglob("*")):
+        relative = path.relative_to(directory).as_posix()
+        if (
+            not path.is_file()
+            or relative in DATASET_META_FILES
+            or relative.startswith(f"{DELTAS_DIR_NAME}/")
+        ):
+            continue
+        digests[relative] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return digests
+
+
+def dataset_version(files: dict[str, str]) -> str:
+    """Derive the dataset version from its file hashes, so unchanged data keeps its version."""
+    content = json.dumps(files, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:VERSION_LENGTH]
+
+
+def cache_keys(files: dict[str, str]) -> dict[str, str]:
+    """Map each top-level JSON file the SPA fetches to a short key of its hash."""
+    return {
+        path: digest[:CACHE_KEY_LENGTH]
+        for path, digest in files.items()
+        if "/" not in path and path.endswith(".json")
+    }
+
+
+def compute_delta(
+    old_files: dict[str, str], new_files: dict[str, str]
+) -> dict[str, list[str]]:
+    """List files added, changed and removed between two hashed versions."""
+    return {
+        "added": sorted(new_files.keys() - old_files.keys()),
+        "changed": sorted(
+            p
+            for p in new_files.keys() & old_files.keys()
+            if new_files[p] != old_files[p]
+        ),
+        "removed": sorted(old_files.keys() - new_files.keys()),
+    }
+
+
+def _read_json(location: str) -> Any:
+    """Read JSON from an http(s) URL or a local path."""
+    if location.startswith(("http://", "https://")):
+        with urllib.request.urlopen(
+            location, timeout=PREVIOUS_FILES_TIMEOUT
+        ) as response:
+            return json.load(response)
+    with open(location, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_published_files(location: str) -> tuple[str, dict[str, str]] | None:
+    """Read a published ``files.json`` and the version named by the manifest next to it.
+
+    ``location`` is the URL or path of ``files.json``. Returns None (and logs
+    a warning) if either file can't be read, e.g. before the first deploy.
+    """
+    if location.startswith(("http://", "https://")):
+        manifest_location = urljoin(location, "manifest.json")
+    else:
+        manifest_location = str(Path(location).with_name("manifest.json"))
+    try:
+        files = _read_json(location)
+        version = _read_json(manifest_location)["version"]
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"No previous dataset at {location}, skipping its delta: {e}")
+        return None
+    return version, files
+
+
+def collect_previous_files(
+    previous_versions: list[Path],
+    previous_files: str | None = None,
+) -> dict[str, dict[str, str]]:
+    """Map earlier versions to their file hashes, oldest first.
+
+    Local versions come from their ``files.json``; the dataset at
+    ``previous_files`` (see read_published_files) is added last, as the
+    version clients currently hold.
+    """
+    previous: dict[str, dict[str, str]] = {}
+    for directory in previous_versions:
+        try:
+            with open(directory / "files.json", encoding="utf-8") as f:
+                previous[directory.name] = json.load(f)
+        except (OSError, ValueError):
+            # Versions from before content hashing have no files.json
+            continue
+    if previous_files:
+        published = read_published_files(previous_files)
+        if published is not None:
+            version, files = published
+            previous.pop(version, None)
+            previous[version] = files
+    return previous
+
+
+def write_deltas(
+    output_dir: Path,
+    version: str,
+    files: dict[str, str],
+    previous: dict[str, dict[str, str]],
+) -> list[str]:
+    """Write ``deltas/<old version>.json`` for each earlier version's file hashes.
+
+    Returns the versions a delta was written for. Clients on one of those
+    versions only need to fetch the listed added and changed files.
+    """
+    deltas_dir = output_dir / DELTAS_DIR_NAME
+    deltas_dir.mkdir(exist_ok=True)
+    written = []
+    for old_version, old_files in previous.items():
+        if old_version == version:
+            continue
+        delta: dict[str, Any] = {
+            "from": old_version,
+            "to": version,
+            **compute_delta(old_files, files),
+        }
+        delta["bytes"] = sum(
+            (output_dir / p).stat().st_size for p in delta["added"] + delta["changed"]
+        )
+        with open(deltas_dir / f"{old_version}.json", "w", encoding="utf-8") as f:
+            json.dump(delta, f, indent=2)
+        logger.info(
+            f"Delta from {old_version}: {len(delta['changed'])} changed, {len(delta['added'])} added, "
+            f"{len(delta['removed'])} removed ({delta['bytes']} bytes to fetch)"
+        )
+        written.append(old_version)
+    return written
+
+
+def generate_popular_particles(
+    tracker: PopularityTracker | None = None,
+    count: int = len(POPULAR_PDGIDS),
+) -> list[dict[str, Any]]:
+    """Generate popular particles list.
+
+    When a tracker with recorded hits is given, its top entries are used and
+    the curated list fills any remaining slots.
+    """
+    candidates = list(POPULAR_PDGIDS)
+    if tracker is not None:
+        candidates = [pdgid for pdgid, _ in tracker.most_common()] + candidates
+
     particles = []
-    for pdgid in popular_pdgids:
+    seen = set()
+    for pdgid in candidates:
+        if len(particles) >= count:
+            break
+        if pdgid in seen:
+            continue
+        seen.add(pdgid)
         try:
             particle = Particle.from_pdgid(pdgid)
-            particles.append({
-                "pdgid": int(particle.pdgid),
-                "name": particle.name,
-                "descriptive_name": get_descriptive_name(particle),
-                "latex_name": getattr(particle, "latex_name", particle.name),
-                "mass": safe_float(particle.mass),
-                "charge": safe_float(particle.charge),
-                "three_charge": getattr(particle, "three_charge", None),
-            })
+            particles.append(
+                {
+                    "pdgid": int(particle.pdgid),
+                    "name": particle.name,
+                    "descriptive_name": get_descriptive_name(particle),
+                    "latex_name": getattr(particle, "latex_name", particle.name),
+                    "mass": safe_float(particle.mass),
+                    "charge": safe_float(particle.charge),
+                    "three_charge": getattr(particle, "three_charge", None),
+                }
+            )
         except Exception as e:
             logger.warning(f"Failed to process popular particle {pdgid}: {e}")
             continue
-    
+
     return particles
 
 
-def main():
-    """Main function to generate all data files."""
+def positive_int(value: str) -> int:
+    """Argparse type for integers of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    """Argparse type for integers of at least 0."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0, got {number}")
+    return number
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--usage-log",
+        action="append",
+        type=Path,
+        default=[],
+        metavar="PATH",
+        help="access log used to rank popular particles (repeatable, .gz supported)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=os.cpu_count() or 1,
+        help="worker processes used to build particle records (1 builds them inline)",
+    )
+    parser.add_argument(
+        "--popular-count",
+        type=positive_int,
+        default=len(POPULAR_PDGIDS),
+        help="number of particles in popular.json",
+    )
+    parser.add_argument(
+        "--keep-versions",
+        type=non_negative_int,
+        default=KEEP_VERSIONS,
+        help="number of published dataset versions to keep",
+    )
+    parser.add_argument(
+        "--previous-files",
+        default=os.environ.get("PREVIOUS_FILES") or None,
+        metavar="URL|PATH",
+        help="published files.json to write a delta against, e.g. the live site's "
+        "(default: $PREVIOUS_FILES)",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="hold particle records as typed columns with interned strings while building",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="PATH",
+        help="run under cProfile and write pstats to PATH (view with snakeviz or python -m pstats)",
+    )
+    return parser.parse_args(argv)
+
+
+def generate(args: argparse.Namespace) -> int:
+    """Generate all data files into a fresh version directory and publish it."""
     logger.info("Starting particle data generation...")
-    
-    # Create output directory
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    
+
     # Get all particles
     try:
         all_particles = Particle.all()
@@ -297,48 +947,168 @@ def main():
     except Exception as e:
         logger.error(f"Failed to load particles: {e}")
         return 1
-    
-    # Generate individual particle files
-    logger.info("Generating individual particle files...")
-    particle_count = 0
-    for particle in all_particles:
-        try:
-            pdgid = int(particle.pdgid)
-            particle_data = create_particle_data(particle)
-            
-            output_file = OUTPUT_DIR / f"{pdgid}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(particle_data, f, indent=2, ensure_ascii=False)
-            
-            particle_count += 1
-        except Exception as e:
-            logger.warning(f"Failed to generate file for particle {particle}: {e}")
-            continue
-    
+
+    # Build into a private directory so a crash or a concurrent build never
+    # leaves a half-written dataset behind OUTPUT_DIR
+    started = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    VERSIONS_DIR.mkdir(parents=True, exist_ok=True)
+    build_dir = VERSIONS_DIR / f".build.{started}.{os.getpid()}.tmp"
+    build_dir.mkdir()
+    previous_versions = (
+        published_versions()[-args.keep_versions :] if args.keep_versions > 0 else []
+    )
+    previous = collect_previous_files(previous_versions, args.previous_files)
+    try:
+        version, summary = write_dataset(args, all_particles, build_dir, previous)
+        version_dir = publish_dataset(build_dir, version)
+    except OSError as e:
+        logger.error(f"Build failed, {OUTPUT_DIR} left unchanged: {e}")
+        return 1
+    finally:
+        if build_dir.exists():
+            shutil.rmtree(build_dir, ignore_errors=True)
+    prune_versions(args.keep_versions, version_dir)
+
+    logger.info("Data generation complete!")
+    logger.info(f"Published version {version} at: {OUTPUT_DIR}")
+    for line in summary:
+        logger.info(f"- {line}")
+
+    return 0
+
+
+def write_dataset(
+    args: argparse.Namespace,
+    all_particles: list[Particle],
+    output_dir: Path,
+    previous: dict[str, dict[str, str]] | None = None,
+) -> tuple[str, list[str]]:
+    """Write the complete dataset to ``output_dir``, returning its version and summary lines."""
+    # Stream particle files: records -> encode -> write. Encoded files are
+    # bounded by the write queue, but every record is also collected for the
+    # particle table, so memory grows with the dataset: about 13 MB as dicts,
+    # under 2 MB as columns with --compact (see memory_report.py)
+    logger.info(f"Generating individual particle files with {args.workers} workers...")
+    source = StageStats("particles")
+    build = StageStats("records")
+    encode = StageStats("encode")
+    records: Any = CompactRecords() if args.compact else []
+    files = metered(
+        encode,
+        encode_particle_files(
+            metered(
+                build,
+                iter_particle_records(
+                    metered(source, all_particles),
+                    workers=args.workers,
+                ),
+            ),
+            records,
+        ),
+    )
+    write = write_files(files, output_dir, total=len(all_particles))
+    report_stages([source, build, encode], write)
+    particle_count = write.items
+
     logger.info(f"Generated {particle_count} particle files")
-    
+
     # Generate name mapping file
     logger.info("Generating name mapping file...")
     name_mapping = build_name_mapping()
-    name_mapping_file = OUTPUT_DIR / "name-mapping.json"
-    with open(name_mapping_file, 'w', encoding='utf-8') as f:
+    name_mapping_file = output_dir / "name-mapping.json"
+    with open(name_mapping_file, "w", encoding="utf-8") as f:
         json.dump(name_mapping, f, indent=2, ensure_ascii=False)
-    
+
+    # Generate quantum-number index file
+    logger.info("Generating quantum-number index file...")
+    quantum_index = build_quantum_index(
+        [int(particle.pdgid) for particle in all_particles]
+    )
+    quantum_index_file = output_dir / "quantum-index.json"
+    with open(quantum_index_file, "w", encoding="utf-8") as f:
+        json.dump(quantum_index, f, separators=(",", ":"))
+
+    # Generate columnar particle table for bulk translation
+    logger.info("Generating particle table...")
+    write_particle_table(records, output_dir / "table")
+
     # Generate popular particles file
     logger.info("Generating popular particles file...")
-    popular_particles = generate_popular_particles()
-    popular_file = OUTPUT_DIR / "popular.json"
-    with open(popular_file, 'w', encoding='utf-8') as f:
+    tracker = None
+    if args.usage_log:
+        tracker = PopularityTracker()
+        hits = load_usage_logs(args.usage_log, tracker)
+        logger.info(
+            f"Recorded {hits} particle hits from {len(args.usage_log)} usage logs"
+        )
+    popular_particles = generate_popular_particles(tracker, args.popular_count)
+    popular_file = output_dir / "popular.json"
+    with open(popular_file, "w", encoding="utf-8") as f:
         json.dump({"particles": popular_particles}, f, indent=2, ensure_ascii=False)
-    
-    logger.info("Data generation complete!")
-    logger.info(f"Generated files in: {OUTPUT_DIR}")
-    logger.info(f"- {particle_count} individual particle files")
-    logger.info(f"- 1 name mapping file with {len(name_mapping)} entries")
-    logger.info(f"- 1 popular particles file with {len(popular_particles)} particles")
-    
-    return 0
+
+    # Hash every data file; the version and cache keys derive from the hashes,
+    # so a rebuild without data changes invalidates nothing
+    logger.info("Generating content hashes, cache keys and deltas...")
+    files = hash_dataset(output_dir)
+    version = dataset_version(files)
+    with open(output_dir / "files.json", "w", encoding="utf-8") as f:
+        json.dump(files, f, indent=2)
+    keys = json.dumps(cache_keys(files), separators=(",", ":")).encode("utf-8")
+    (output_dir / "keys.json").write_bytes(keys)
+    delta_versions = write_deltas(output_dir, version, files, previous or {})
+    previous_versions = [old for old in previous or {} if old != version]
+
+    # Write the manifest last: clients only treat the dataset as ready once it exists
+    logger.info("Generating manifest file...")
+    manifest = {
+        "version": version,
+        "keys": hashlib.sha256(keys).hexdigest()[:CACHE_KEY_LENGTH],
+        "previous_version": previous_versions[-1] if previous_versions else None,
+        "deltas_from": delta_versions,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "particle_version": particle_package.__version__,
+        "particle_count": particle_count,
+        "name_mapping_entries": len(name_mapping),
+        "warm_up": [p["pdgid"] for p in popular_particles[:WARM_UP_COUNT]],
+    }
+    manifest_file = output_dir / "manifest.json"
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    return version, [
+        f"{particle_count} individual particle files",
+        f"1 name mapping file with {len(name_mapping)} entries",
+        f"1 quantum-number index with {len(quantum_index['properties'])} properties",
+        f"1 particle table with {len(records)} rows",
+        f"1 popular particles file with {len(popular_particles)} particles",
+        f"1 content hash file with {len(files)} entries and {len(delta_versions)} deltas",
+        "1 cache key file",
+        "1 manifest file",
+    ]
+
+
+def main(argv: list[str] | None = None):
+    """Main function to generate all data files, optionally under cProfile."""
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    if args.profile is None:
+        return generate(args)
+
+    if args.workers > 1:
+        logger.warning(
+            "Profiling only covers the main process; use --workers 1 to include record building"
+        )
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(generate, args)
+    finally:
+        profiler.dump_stats(args.profile)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(
+            PROFILE_SUMMARY_LINES
+        )
+        logger.info(f"Profile written to {args.profile}\n{summary.getvalue()}")
 
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    exit(main())
@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = []
+# ///
+"""
+Load-test the particle explorer and report throughput, latency and resources.
+
+By default this launches a local stand-in deployment: several server processes
+sharing one port (SO_REUSEPORT) that serve the built SPA from frontend/build
+the way GitHub Pages does, including the SPA fallback to index.html. Pass
+--url to target an existing deployment instead.
+
+The traffic mix replays what browsers do:
+- popular: home page load (index.html, the /_app/ assets it links, the
+  manifest, cache keys, popular list and name mapping, and the warm-up
+  prefetches)
+- search: name search with Zipf-distributed queries; names are resolved and
+  ranked in the browser, so only the top-ranked record is requested
+- detail: particle detail page load for a Zipf-distributed PDG ID (the same
+  page-load requests as popular, plus the record)
+
+A record that warm-up already prefetched is not fetched again; the SPA sends
+an untagged HEAD request for it instead so the visit shows up in usage logs.
+
+Each concurrency level runs for --duration seconds; together the levels form
+a saturation curve. Reports are written as JSON and can be compared against
+the report of a previous release with --compare.
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+import re
+import resource
+import socket
+import threading
+import time
+from collections.abc import Callable
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import SplitResult, urlencode, urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Built SPA served by the local stand-in deployment
+BUILD_DIR = Path(__file__).parent / "frontend" / "build"
+
+# Relative weights of the traffic mix
+DEFAULT_MIX = {"popular": 1.0, "search": 3.0, "detail": 6.0}
+
+# Zipf exponent for query and PDG ID popularity
+DEFAULT_ZIPF_S = 1.1
+
+# Time the local server gets to come up
+SERVER_START_TIMEOUT = 10.0
+
+# Hot particle records the SPA prefetches on every page load (data.js)
+WARM_UP_COUNT = 8
+
+# Scripts and stylesheets referenced by index.html, below the base path
+ASSET_PATTERN = re.compile(r"/_app/[^\"'()\s]+")
+
+# A browser action is the list of (method, path) requests it makes
+Request = tuple[str, str]
+
+
+class SPARequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler with a URL base path and SPA fallback to index.html."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle hold the body
+    disable_nagle_algorithm = True
+
+    def __init__(self, *args: Any, base_path: str = "", **kwargs: Any):
+        self.base_path = base_path
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def translate_path(self, path: str) -> str:
+        if self.base_path and path.startswith(self.base_path):
+            path = path[len(self.base_path) :] or "/"
+        translated = super().translate_path(path)
+        # Client-side routes (e.g. /pdgid/11) are answered by the SPA shell
+        if not os.path.exists(translated) and not os.path.splitext(translated)[1]:
+            return os.path.join(self.directory, "index.html")
+        return translated
+
+
+class ReusePortHTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server that lets several processes share one port."""
+
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def serve(port: int, root: Path, base_path: str) -> None:
+    """Serve ``root`` on ``port`` until terminated (runs in a worker process)."""
+    handler = partial(SPARequestHandler, directory=str(root), base_path=base_path)
+    with ReusePortHTTPServer(("127.0.0.1", port), handler) as server:
+        server.serve_forever()
+
+
+def start_servers(
+    root: Path, base_path: str, workers: int
+) -> tuple[str, list[multiprocessing.Process]]:
+    """Start ``workers`` server processes on a free port and wait until they answer."""
+    if not (root / "index.html").exists():
+        raise SystemExit(
+            f"{root} has no index.html; build the frontend first (just frontend)"
+        )
+    if workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+        logger.warning(
+            "SO_REUSEPORT is not available, falling back to a single server process"
+        )
+        workers = 1
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    processes = []
+    for _ in range(workers):
+        process = multiprocessing.Process(
+            target=serve, args=(port, root, base_path), daemon=True
+        )
+        process.start()
+        processes.append(process)
+
+    url = f"http://127.0.0.1:{port}{base_path}"
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while True:
+        try:
+            fetch(url, "/")
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                stop_servers(processes)
+                raise SystemExit(
+                    f"Local server did not come up on port {port}"
+                ) from None
+            time.sleep(0.1)
+    logger.info(f"Started {workers} server processes at {url}")
+    return url, processes
+
+
+def stop_servers(processes: list[multiprocessing.Process]) -> None:
+    """Terminate local server processes."""
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join()
+
+
+def connect(parts: SplitResult) -> http.client.HTTPConnection:
+    """Open an HTTP connection to the host and port of a split URL."""
+    return http.client.HTTPConnection(parts.netloc, timeout=10)
+
+
+def fetch(url: str, path: str) -> bytes:
+    """GET ``path`` below ``url`` on a fresh connection."""
+    parts = urlsplit(url)
+    conn = connect(parts)
+    try:
+        conn.request("GET", parts.path + path)
+        response = conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise OSError(f"GET {path} returned {response.status}")
+        return body
+    finally:
+        conn.close()
+
+
+class ZipfSampler:
+    """Draw items with probability proportional to 1 / rank**s."""
+
+    def __init__(self, items: list[Any], s: float):
+        self.items = items
+        weights = [1.0 / (rank**s) for rank in range(1, len(items) + 1)]
+        total = 0.0
+        self.cum_weights = []
+        for weight in weights:
+            total += weight
+            self.cum_weights.append(total)
+
+    def sample(self, rng: random.Random) -> Any:
+        return rng.choices(self.items, cum_weights=self.cum_weights)[0]
+
+
+def rank_matches(name_mapping: dict[str, list[int]], query: str) -> list[int]:
+    """Rank PDG IDs matching a name query like rankMatches in data.js."""
+    best: dict[int, tuple[int, int]] = {}
+    for key, pdgids in name_mapping.items():
+        if key == query:
+            rank = 0
+        elif key.startswith(query):
+            rank = 1
+        elif query in key:
+            rank = 2
+        elif key in query:
+            rank = 3
+        else:
+            continue
+        length = -len(key) if rank == 3 else len(key)
+        for pdgid in pdgids:
+            if pdgid not in best or (rank, length) < best[pdgid]:
+                best[pdgid] = (rank, length)
+    return sorted(best, key=lambda pdgid: (*best[pdgid], abs(pdgid), -pdgid))
+
+
+class TrafficMix:
+    """Turns the dataset into weighted browser actions, each a list of requests."""
+
+    def __init__(self, url: str, mix: dict[str, float], zipf_s: float):
+        self.kinds = [kind for kind, weight in mix.items() if weight > 0]
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.name_mapping: dict[str, list[int]] = json.loads(
+            fetch(url, "/particles/name-mapping.json")
+        )
+        popular = json.loads(fetch(url, "/particles/popular.json"))["particles"]
+        manifest = json.loads(fetch(url, "/particles/manifest.json"))
+
+        # Requests every page load makes: the SPA shell and its assets, then
+        # the data loaded by warm-up, with hot records tagged as prefetches
+        index = fetch(url, "/").decode("utf-8", errors="replace")
+        self.assets = list(dict.fromkeys(ASSET_PATTERN.findall(index)))
+        # Cache keys of each data file, as data.js adds them to every request
+        self.keys: dict[str, str] = {}
+        if manifest.get("keys"):
+            self.keys["keys.json"] = manifest["keys"]
+            self.keys.update(json.loads(fetch(url, self.data_path("keys.json"))))
+        warm_up = manifest.get("warm_up") or [p["pdgid"] for p in popular]
+        self.prefetched = set(warm_up[:WARM_UP_COUNT])
+        page_paths = (
+            self.assets
+            + [
+                "/particles/manifest.json",
+                self.data_path("keys.json"),
+                self.data_path("popular.json"),
+                self.data_path("name-mapping.json"),
+            ]
+            + [
+                self.data_path(f"{pdgid}.json", prefetch=True)
+                for pdgid in warm_up[:WARM_UP_COUNT]
+            ]
+        )
+        self.page_load: list[Request] = [("GET", path) for path in page_paths]
+
+        # Popular particles rank highest, then everything else in a fixed order
+        popular_ids = [p["pdgid"] for p in popular]
+        popular_set = set(popular_ids)
+        all_ids = sorted({pdgid for ids in self.name_mapping.values() for pdgid in ids})
+        others = [pdgid for pdgid in all_ids if pdgid not in popular_set]
+        random.Random(0).shuffle(others)
+        self.pdgids = ZipfSampler(popular_ids + others, zipf_s)
+
+        ids_to_names: dict[int, list[str]] = {}
+        for name, ids in self.name_mapping.items():
+            for pdgid in ids:
+                ids_to_names.setdefault(pdgid, []).append(name)
+        queries = []
+        seen = set()
+        for pdgid in self.pdgids.items:
+            for name in sorted(ids_to_names.get(pdgid, []), key=len):
+                if name not in seen:
+                    seen.add(name)
+                    queries.append(name)
+        self.queries = ZipfSampler(queries, zipf_s)
+        # Top-ranked PDG ID per query, filled in as queries are drawn
+        self.search_hits: dict[str, int] = {}
+
+    def search_hit(self, query: str) -> int:
+        """Return the PDG ID the SPA navigates to for a name search."""
+        if query not in self.search_hits:
+            self.search_hits[query] = rank_matches(
+                self.name_mapping, query.lower().strip()
+            )[0]
+        return self.search_hits[query]
+
+    def next_action(self, rng: random.Random) -> tuple[str, list[Request]]:
+        kind = rng.choices(self.kinds, weights=self.weights)[0]
+        if kind == "popular":
+            return kind, [("GET", "/")] + self.page_load
+        if kind == "search":
+            # Searching happens on a loaded page: the name mapping is cached
+            # and navigating to the result only loads its record
+            pdgid = self.search_hit(self.queries.sample(rng))
+            return kind, self.record_fetch(pdgid)
+        pdgid = self.pdgids.sample(rng)
+        return kind, [("GET", f"/pdgid/{pdgid}")] + self.page_load + self.record_fetch(
+            pdgid
+        )
+
+    def record_fetch(self, pdgid: int) -> list[Request]:
+        """Request showing a particle record: a HEAD beacon if warm-up cached it."""
+        method = "HEAD" if pdgid in self.prefetched else "GET"
+        return [(method, self.data_path(f"{pdgid}.json"))]
+
+    def data_path(self, name: str, prefetch: bool = False) -> str:
+        """Path of a data file with its cache key and prefetch tag, like data.js builds it."""
+        params = {"h": self.keys[name]} if name in self.keys else {}
+        if prefetch:
+            params["prefetch"] = "1"
+        return f"/particles/{name}" + (f"?{urlencode(params)}" if params else "")
+
+
+class ProcessSampler:
+    """CPU time and RSS of a set of processes, read from /proc (Linux only)."""
+
+    def __init__(self, pids: list[int]):
+        self.pids = pids
+        self.available = bool(pids) and Path("/proc/self/stat").exists()
+        self.ticks = os.sysconf("SC_CLK_TCK") if self.available else 1
+
+    def cpu_seconds(self) -> float | None:
+        if not self.available:
+            return None
+        total = 0
+        for pid in self.pids:
+            fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+            total += int(fields[11]) + int(fields[12])  # utime + stime
+        return total / self.ticks
+
+    def rss_bytes(self) -> int | None:
+        if not self.available:
+            return None
+        total = 0
+        for pid in self.pids:
+            for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1]) * 1024
+        return total
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+def latency_summary(latencies: list[float]) -> dict[str, float | None]:
+    """Latency percentiles in milliseconds."""
+    values = sorted(latencies)
+    summary = {
+        f"p{int(fraction * 100)}": percentile(values, fraction)
+        for fraction in (0.5, 0.9, 0.99)
+    }
+    summary["max"] = values[-1] if values else None
+    return {
+        key: None if value is None else round(value * 1000, 3)
+        for key, value in summary.items()
+    }
+
+
+def run_client(
+    url: str,
+    traffic: TrafficMix,
+    deadline: float,
+    seed: int,
+    record: Callable[[str, float, bool], None],
+) -> None:
+    """Replay actions over one keep-alive connection until ``deadline``."""
+    parts = urlsplit(url)
+    rng = random.Random(seed)
+    conn = connect(parts)
+    while time.monotonic() < deadline:
+        kind, requests = traffic.next_action(rng)
+        for method, path in requests:
+            start = time.perf_counter()
+            try:
+                conn.request(method, parts.path + path)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = connect(parts)
+                ok = False
+            record(kind, time.perf_counter() - start, ok)
+    conn.close()
+
+
+def run_level(
+    url: str,
+    traffic: TrafficMix,
+    concurrency: int,
+    duration: float,
+    sampler: ProcessSampler,
+) -> dict[str, Any]:
+    """Run one closed-loop concurrency level and summarize it."""
+    lock = threading.Lock()
+    latencies: dict[str, list[float]] = {kind: [] for kind in traffic.kinds}
+    errors: dict[str, int] = {kind: 0 for kind in traffic.kinds}
+
+    def record(kind: str, seconds: float, ok: bool) -> None:
+        with lock:
+            latencies[kind].append(seconds)
+            if not ok:
+                errors[kind] += 1
+
+    server_cpu = sampler.cpu_seconds()
+    client_cpu = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.monotonic()
+    deadline = start + duration
+    threads = [
+        threading.Thread(target=run_client, args=(url, traffic, deadline, seed, record))
+        for seed in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+    client_cpu_after = resource.getrusage(resource.RUSAGE_SELF)
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    level: dict[str, Any] = {
+        "concurrency": concurrency,
+        "requests": len(all_latencies),
+        "errors": sum(errors.values()),
+        "rps": round(len(all_latencies) / elapsed, 1),
+        "latency_ms": latency_summary(all_latencies),
+        "by_kind": {
+            kind: {
+                "requests": len(values),
+                "errors": errors[kind],
+                "latency_ms": latency_summary(values),
+            }
+            for kind, values in latencies.items()
+        },
+        "client_cpu_percent": round(
+            100
+            * (
+                (client_cpu_after.ru_utime + client_cpu_after.ru_stime)
+                - (client_cpu.ru_utime + client_cpu.ru_stime)
+            )
+            / elapsed,
+            1,
+        ),
+        "server_cpu_percent": None,
+        "server_rss_mb": None,
+    }
+    server_cpu_after = sampler.cpu_seconds()
+    server_rss = sampler.rss_bytes()
+    if (
+        server_cpu is not None
+        and server_cpu_after is not None
+        and server_rss is not None
+    ):
+        level["server_cpu_percent"] = round(
+            100 * (server_cpu_after - server_cpu) / elapsed, 1
+        )
+        level["server_rss_mb"] = round(server_rss / 2**20, 1)
+    return level
+
+
+def format_level(level: dict[str, Any]) -> str:
+    """One report table row."""
+    latency = level["latency_ms"]
+    server = (
+        f"server {level['server_cpu_percent']:6.1f}% CPU {level['server_rss_mb']:7.1f} MB"
+        if level["server_cpu_percent"] is not None
+        else "server n/a"
+    )
+    return (
+        f"c={level['concurrency']:<4} {level['rps']:9.1f} req/s  "
+        f"p50 {latency['p50'] or 0:7.2f} ms  p99 {latency['p99'] or 0:7.2f} ms  "
+        f"errors {level['errors']:<5} {server}  client {level['client_cpu_percent']:6.1f}% CPU"
+    )
+
+
+def compare_reports(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    """Describe throughput and tail latency changes per concurrency level."""
+    previous = {level["concurrency"]: level for level in baseline["levels"]}
+    lines = []
+    for level in current["levels"]:
+        old = previous.get(level["concurrency"])
+        if old is None:
+            continue
+        rps_change = (
+            100 * (level["rps"] - old["rps"]) / old["rps"] if old["rps"] else math.nan
+        )
+        old_p99, new_p99 = old["latency_ms"]["p99"], level["latency_ms"]["p99"]
+        p99_change = (
+            100 * (new_p99 - old_p99) / old_p99 if old_p99 and new_p99 else math.nan
+        )
+        lines.append(
+            f"c={level['concurrency']:<4} req/s {old['rps']:9.1f} -> {level['rps']:9.1f} ({rps_change:+.1f}%)  "
+            f"p99 {old_p99 or 0:7.2f} -> {new_p99 or 0:7.2f} ms ({p99_change:+.1f}%)"
+        )
+    return lines
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Parse a traffic mix like "popular=1,search=3,detail=6"."""
+    mix = {kind: 0.0 for kind in DEFAULT_MIX}
+    for item in value.split(","):
+        kind, _, weight = item.partition("=")
+        if kind not in mix:
+            raise argparse.ArgumentTypeError(f"unknown traffic kind {kind!r}")
+        mix[kind] = float(weight)
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("traffic mix needs a positive weight")
+    return mix
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--url", help="test an existing deployment instead of a local one"
+    )
+    parser.add_argument(
+        "--root", type=Path, default=BUILD_DIR, help="directory served locally"
+    )
+    parser.add_argument(
+        "--base-path", default="", help="URL prefix of the local deployment"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="local server processes",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(c) for c in value.split(",")],
+        default=[1, 4, 16, 64],
+        help="comma-separated concurrent clients per level",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="seconds per level"
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=DEFAULT_MIX,
+        help="traffic weights, e.g. popular=1,search=3,detail=6",
+    )
+    parser.add_argument(
+        "--zipf", type=float, default=DEFAULT_ZIPF_S, help="Zipf exponent"
+    )
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument(
+        "--compare", type=Path, help="JSON report of a previous run to compare with"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    """Run the load test."""
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    processes: list[multiprocessing.Process] = []
+    if args.url:
+        url = args.url.rstrip("/")
+    else:
+        url, processes = start_servers(
+            args.root, args.base_path.rstrip("/"), args.workers
+        )
+
+    try:
+        traffic = TrafficMix(url, args.mix, args.zipf)
+        sampler = ProcessSampler([p.pid for p in processes])
+        logger.info(
+            f"Replaying {len(traffic.queries.items)} queries over {len(traffic.pdgids.items)} particles, "
+            f"mix {args.mix}"
+        )
+        levels = []
+        for concurrency in args.concurrency:
+            level = run_level(url, traffic, concurrency, args.duration, sampler)
+            logger.info(format_level(level))
+            levels.append(level)
+    finally:
+        stop_servers(processes)
+
+    report = {
+        "url": url if args.url else "local",
+        "workers": len(processes) or None,
+        "mix": args.mix,
+        "zipf": args.zipf,
+        "duration": args.duration,
+        "levels": levels,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        logger.info(f"Report written to {args.output}")
+    if args.compare:
+        for line in compare_reports(json.loads(args.compare.read_text()), report):
+            logger.info(line)
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
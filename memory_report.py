@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = []
+# ///
+"""
+Report the memory held by the particle dataset in dict form and in compact form.
+
+Loads the published dataset (frontend/static/particles by default) the way a
+process serving it would: every particle record, the name mapping and the
+bulk translation table. Each structure is measured as plain dicts and lists
+and again as its compact counterpart (typed columns, interned strings, CSR
+name mapping).
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+from particle_table import (
+    DATA_DIR,
+    CompactNameMapping,
+    CompactRecords,
+    deep_sizeof,
+    load_particle_table,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def load_records(data_dir: Path) -> list[Any]:
+    """Load every particle record file as a dict."""
+    records = []
+    for path in sorted(data_dir.glob("*.json")):
+        if path.stem.lstrip("-").isdigit():
+            with open(path, encoding="utf-8") as f:
+                records.append(json.load(f))
+    return records
+
+
+def measure(data_dir: Path) -> list[tuple[str, int, int]]:
+    """Return (structure, dict bytes, compact bytes) rows."""
+    rows = []
+
+    records = load_records(data_dir)
+    rows.append(
+        (
+            "particle records",
+            deep_sizeof(records),
+            deep_sizeof(CompactRecords.from_records(records)),
+        )
+    )
+    del records
+
+    with open(data_dir / "name-mapping.json", encoding="utf-8") as f:
+        name_mapping = json.load(f)
+    rows.append(
+        (
+            "name mapping",
+            deep_sizeof(name_mapping),
+            deep_sizeof(CompactNameMapping.from_dict(name_mapping)),
+        )
+    )
+    del name_mapping
+
+    table_dir = data_dir / "table"
+    if table_dir.exists():
+        # The table is already columnar; compare against the same rows as dicts
+        table = load_particle_table(table_dir)
+        fields = [field for field in table if field != "pdgid"]
+        as_dicts = [
+            {"pdgid": int(pdgid), **{field: table[field][i] for field in fields}}
+            for i, pdgid in enumerate(table["pdgid"])
+        ]
+        for row in as_dicts:
+            for field in fields:
+                if isinstance(row[field], float):
+                    row[field] = float(row[field])
+        rows.append(("translation table", deep_sizeof(as_dicts), deep_sizeof(table)))
+
+    return rows
+
+
+def main(argv: list[str] | None = None):
+    """Print the memory report."""
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--data-dir", type=Path, default=DATA_DIR, help="published dataset to measure"
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if not (args.data_dir / "name-mapping.json").exists():
+        logger.error(f"No dataset in {args.data_dir}; run generate_data.py first")
+        return 1
+
+    rows = measure(args.data_dir)
+    if args.json:
+        report = [
+            {"structure": name, "dict_bytes": before, "compact_bytes": after}
+            for name, before, after in rows
+        ]
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{'structure':<20} {'dict form':>12} {'compact':>12} {'saved':>7}")
+    for name, before, after in rows + [
+        ("total", sum(r[1] for r in rows), sum(r[2] for r in rows))
+    ]:
+        saved = f"{1 - after / before:6.0%}" if before else f"{'-':>6}"
+        print(f"{name:<20} {before / 2**20:10.2f}MB {after / 2**20:10.2f}MB {saved}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
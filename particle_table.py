@@ -0,0 +1,351 @@
+"""
+Particle table and compact in-memory structures for the particle dataset.
+
+Shared by generate_data.py, which writes the table, and by anything that
+reads the published dataset in-process (memory_report.py, or user code
+translating PDG ID columns). Importing this module has no side effects and
+needs neither the particle package nor numpy; numpy is used when installed.
+"""
+
+import ast
+import bisect
+import io
+import json
+import math
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+try:
+    import numpy as np  # ty: ignore[unresolved-import]
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None  # ty: ignore[invalid-assignment]
+
+# Published dataset, a symlink to the current version written by generate_data.py
+DATA_DIR = Path(__file__).parent / "frontend" / "static" / "particles"
+
+# Particle table columns: numeric record fields are stored as float64 (NaN for
+# missing values), strings as JSON lists aligned with the sorted pdgid column
+TABLE_DIR = DATA_DIR / "table"
+TABLE_NUMERIC_FIELDS = [
+    "mass",
+    "width",
+    "charge",
+    "three_charge",
+    "spin",
+    "lifetime",
+    "ctau",
+]
+TABLE_STRING_FIELDS = ["name", "descriptive_name", "latex_name"]
+
+# Field layout of the records built by create_particle_data, used by
+# CompactRecords: "float" columns are float64 (NaN for None), "int" columns
+# int64 (MISSING_INT for None) and "str" columns interned strings
+RECORD_LAYOUT = [
+    ("pdgid", "int"),
+    ("name", "str"),
+    ("descriptive_name", "str"),
+    ("latex_name", "str"),
+    ("mass", "float"),
+    ("mass_upper", "float"),
+    ("mass_lower", "float"),
+    ("width", "float"),
+    ("width_upper", "float"),
+    ("width_lower", "float"),
+    ("charge", "float"),
+    ("three_charge", "int"),
+    ("spin", "float"),
+    ("parity", "int"),
+    ("c_parity", "int"),
+    ("g_parity", "int"),
+    ("anti_particle_pdgid", "int"),
+    ("anti_particle_name", "str"),
+    ("status", "str"),
+    ("lifetime", "float"),
+    ("ctau", "float"),
+]
+MISSING_INT = -(2**63)
+
+
+class CompactRecords:
+    """Particle records stored as typed columns instead of one dict per particle.
+
+    Numbers live in ``array`` columns and strings are interned, so repeated
+    names, LaTeX and status strings are shared. Indexing rebuilds the record
+    dict, which serializes to the same JSON as the original.
+    """
+
+    def __init__(self):
+        self.columns: dict[str, Any] = {}
+        for field, kind in RECORD_LAYOUT:
+            if kind == "float":
+                self.columns[field] = array("d")
+            elif kind == "int":
+                self.columns[field] = array("q")
+            else:
+                self.columns[field] = []
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict[str, Any]]) -> "CompactRecords":
+        compact = cls()
+        for record in records:
+            compact.append(record)
+        return compact
+
+    def append(self, record: dict[str, Any]) -> None:
+        for field, kind in RECORD_LAYOUT:
+            value = record[field]
+            if kind == "float":
+                value = math.nan if value is None else float(value)
+            elif kind == "int":
+                value = MISSING_INT if value is None else int(value)
+            elif value is not None:
+                value = sys.intern(value)
+            self.columns[field].append(value)
+
+    def __len__(self) -> int:
+        return len(self.columns["pdgid"])
+
+    def __getitem__(self, index: int) -> dict[str, Any]:
+        record = {}
+        for field, kind in RECORD_LAYOUT:
+            value = self.columns[field][index]
+            if kind == "float" and math.isnan(value):
+                value = None
+            elif kind == "int" and value == MISSING_INT:
+                value = None
+            record[field] = value
+        return record
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def column(self, field: str, order: list[int] | None = None) -> Any:
+        """Return a column, optionally reordered; int columns come back as float64."""
+        values = self.columns[field]
+        if order is not None:
+            values = [values[i] for i in order]
+        if field == "pdgid" or dict(RECORD_LAYOUT)[field] == "str":
+            return values
+        if dict(RECORD_LAYOUT)[field] == "int":
+            return array(
+                "d", (math.nan if v == MISSING_INT else float(v) for v in values)
+            )
+        return array("d", values)
+
+
+class CompactNameMapping:
+    """Name mapping in CSR layout: sorted names, offsets into one flat PDG ID array.
+
+    ``ids[offsets[i]:offsets[i + 1]]`` are the PDG IDs of ``names[i]``. This
+    replaces one list of ints per name with two flat ``array`` columns.
+    """
+
+    def __init__(self, names: list[str], offsets: array, ids: array):
+        self.names = names
+        self.offsets = offsets
+        self.ids = ids
+
+    @classmethod
+    def from_dict(cls, mapping: dict[str, list[int]]) -> "CompactNameMapping":
+        names = sorted(mapping)
+        offsets = array("i", [0])
+        ids = array("i")
+        for name in names:
+            ids.extend(mapping[name])
+            offsets.append(len(ids))
+        return cls([sys.intern(name) for name in names], offsets, ids)
+
+    def get(self, name: str, default: list[int] | None = None) -> list[int] | None:
+        i = bisect.bisect_left(self.names, name)
+        if i == len(self.names) or self.names[i] != name:
+            return default
+        return self.ids[self.offsets[i] : self.offsets[i + 1]].tolist()
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def items(self) -> Iterator[tuple[str, list[int]]]:
+        for i, name in enumerate(self.names):
+            yield name, self.ids[self.offsets[i] : self.offsets[i + 1]].tolist()
+
+    def to_dict(self) -> dict[str, list[int]]:
+        return dict(self.items())
+
+
+def deep_sizeof(obj: Any, seen: set | None = None) -> int:
+    """Approximate bytes held by ``obj`` and everything it references (shared objects count once)."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, list | tuple | set | frozenset):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    # NumPy views report only their header; count the buffer they wrap
+    base = getattr(obj, "base", None)
+    if base is not None:
+        size += deep_sizeof(base, seen)
+    return size
+
+
+def _to_little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def write_particle_table(
+    records: Iterable[dict[str, Any]],
+    table_dir: Path = TABLE_DIR,
+) -> None:
+    """Write particle records as columns sorted by pdgid.
+
+    ``pdgid.i32`` holds int32 and ``<field>.f64`` float64 values, both
+    little-endian; ``strings.json`` holds the string columns and
+    ``columns.json`` describes the layout. ``records`` may be a
+    CompactRecords instance.
+    """
+    if not isinstance(records, CompactRecords):
+        records = CompactRecords.from_records(records)
+    order = sorted(range(len(records)), key=records.columns["pdgid"].__getitem__)
+    table_dir.mkdir(parents=True, exist_ok=True)
+
+    (table_dir / "pdgid.i32").write_bytes(
+        _to_little_endian(array("i", records.column("pdgid", order)))
+    )
+    for field in TABLE_NUMERIC_FIELDS:
+        (table_dir / f"{field}.f64").write_bytes(
+            _to_little_endian(records.column(field, order))
+        )
+
+    strings = {field: records.column(field, order) for field in TABLE_STRING_FIELDS}
+    with open(table_dir / "strings.json", "w", encoding="utf-8") as f:
+        json.dump(strings, f, ensure_ascii=False, separators=(",", ":"))
+
+    columns = {"pdgid": "<i4", **{field: "<f8" for field in TABLE_NUMERIC_FIELDS}}
+    with open(table_dir / "columns.json", "w", encoding="utf-8") as f:
+        json.dump(
+            {"rows": len(records), "columns": columns, "strings": TABLE_STRING_FIELDS},
+            f,
+            indent=2,
+        )
+
+
+def load_particle_table(table_dir: Path = TABLE_DIR) -> dict[str, Any]:
+    """Load a particle table written by write_particle_table.
+
+    Numeric columns are numpy arrays when numpy is installed, ``array`` otherwise.
+    """
+    table: dict[str, Any] = {}
+    pdgids = _from_little_endian("i", (table_dir / "pdgid.i32").read_bytes())
+    table["pdgid"] = np.asarray(pdgids, dtype=np.int64) if np is not None else pdgids
+    for field in TABLE_NUMERIC_FIELDS:
+        column = _from_little_endian("d", (table_dir / f"{field}.f64").read_bytes())
+        table[field] = np.asarray(column) if np is not None else column
+    with open(table_dir / "strings.json", encoding="utf-8") as f:
+        strings = json.load(f)
+    for field, values in strings.items():
+        table[field] = [
+            None if value is None else sys.intern(value) for value in values
+        ]
+    return table
+
+
+def _decode_pdgids(pdgids: Any) -> Any:
+    """Accept raw little-endian int32 bytes, NumPy .npy bytes or a sequence of ints."""
+    if not isinstance(pdgids, bytes | bytearray | memoryview):
+        return pdgids
+    data = bytes(pdgids)
+    if data.startswith(b"\x93NUMPY"):
+        if np is not None:
+            return np.load(io.BytesIO(data), allow_pickle=False)
+        # Minimal .npy reader for 1-D little-endian int32/int64 arrays
+        major = data[6]
+        header_len_size = 2 if major == 1 else 4
+        header_len = int.from_bytes(data[8 : 8 + header_len_size], "little")
+        start = 8 + header_len_size
+        header = ast.literal_eval(data[start : start + header_len].decode("latin1"))
+        typecodes = {"<i4": "i", "<i8": "q"}
+        if (
+            header["descr"] not in typecodes
+            or header["fortran_order"]
+            or len(header["shape"]) > 1
+        ):
+            raise ValueError(f"Unsupported .npy array: {header}")
+        return _from_little_endian(
+            typecodes[header["descr"]], data[start + header_len :]
+        )
+    if len(data) % 4:
+        raise ValueError("Raw PDG ID input must be a multiple of 4 bytes (int32)")
+    return _from_little_endian("i", data)
+
+
+def translate_pdgids(
+    pdgids: Any,
+    properties: Iterable[str] = ("name", "mass", "charge"),
+    table: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Translate a column of PDG IDs into aligned property columns.
+
+    ``pdgids`` may be raw little-endian int32 bytes, NumPy ``.npy`` bytes, a
+    NumPy array or any sequence of ints. The result maps each property to a
+    column aligned with the input, plus a boolean ``found`` column; unknown
+    PDG IDs get NaN (numeric) or None (string). With numpy installed this is
+    a vectorized binary-search gather against the sorted pdgid column.
+    """
+    properties = list(properties)
+    known = set(TABLE_NUMERIC_FIELDS) | set(TABLE_STRING_FIELDS)
+    unknown = [p for p in properties if p not in known]
+    if unknown:
+        raise ValueError(f"Unknown properties: {', '.join(unknown)}")
+    if table is None:
+        table = load_particle_table()
+    ids = _decode_pdgids(pdgids)
+
+    if np is not None:
+        keys = np.asarray(table["pdgid"])
+        ids = np.asarray(ids, dtype=np.int64).ravel()
+        rows = np.minimum(np.searchsorted(keys, ids), max(len(keys) - 1, 0))
+        found = keys[rows] == ids if len(keys) else np.zeros(len(ids), dtype=bool)
+        result: dict[str, Any] = {"found": found}
+        for prop in properties:
+            if prop in TABLE_STRING_FIELDS:
+                column = np.array(table[prop] + [None], dtype=object)
+                result[prop] = column[np.where(found, rows, len(keys))]
+            else:
+                result[prop] = np.where(found, np.asarray(table[prop])[rows], np.nan)
+        return result
+
+    row_of = {pdgid: row for row, pdgid in enumerate(table["pdgid"])}
+    rows = [row_of.get(pdgid) for pdgid in ids]
+    result = {"found": [row is not None for row in rows]}
+    for prop in properties:
+        column = table[prop]
+        if prop in TABLE_STRING_FIELDS:
+            result[prop] = [None if row is None else column[row] for row in rows]
+        else:
+            result[prop] = array(
+                "d", (math.nan if row is None else column[row] for row in rows)
+            )
+    return result
@@ -1,14 +1,17 @@
-"""Pytest configuration and fixtures for particle physics API tests."""
+"""Pytest configuration and shared fixtures."""
 
 import pytest
-from fastapi.testclient import TestClient
 
-from backend.main import app
+import particle_table
 
 
 @pytest.fixture
 def client():
     """Create a test client for the FastAPI application."""
+    # Imported here so tests that don't use the API are collected without it
+    from backend.main import app
+    from fastapi.testclient import TestClient
+
     return TestClient(app)
 
 
@@ -63,3 +66,33 @@ def popular_particles_pdgids():
         5,
         6,
     ]
+
+
+def make_record(pdgid, name, mass=None, charge=0.0, **fields):
+    """Build a particle record with every field of RECORD_LAYOUT."""
+    record = {field: None for field, _ in particle_table.RECORD_LAYOUT}
+    record.update(
+        pdgid=pdgid,
+        name=name,
+        descriptive_name=name,
+        latex_name=name,
+        mass=mass,
+        charge=charge,
+    )
+    record.update(fields)
+    return record
+
+
+@pytest.fixture
+def records():
+    """A few particle records, deliberately not sorted by PDG ID."""
+    return [
+        make_record(
+            2212, "p", mass=938.27, charge=1.0, three_charge=3, status="Common"
+        ),
+        make_record(
+            11, "e-", mass=0.511, charge=-1.0, three_charge=-3, anti_particle_pdgid=-11
+        ),
+        make_record(22, "gamma", mass=0.0, latex_name="\\gamma", parity=-1),
+        make_record(-11, "e+", mass=0.511, charge=1.0, anti_particle_name="e-"),
+    ]
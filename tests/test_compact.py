@@ -0,0 +1,51 @@
+"""Unit tests for the compact in-memory record and name mapping structures."""
+
+import json
+import math
+
+from particle_table import CompactNameMapping, CompactRecords
+
+
+class TestCompactRecords:
+    """Tests for the columnar record store."""
+
+    def test_round_trip(self, records):
+        """Test that records come back identical, None values included."""
+        compact = CompactRecords.from_records(records)
+
+        assert len(compact) == len(records)
+        assert list(compact) == records
+        assert [json.dumps(r, indent=2) for r in compact] == [
+            json.dumps(r, indent=2) for r in records
+        ]
+
+    def test_strings_are_interned(self, records):
+        """Test that equal strings share one object."""
+        compact = CompactRecords.from_records(records)
+        names = compact.columns["name"] + compact.columns["anti_particle_name"]
+
+        assert [n for n in names if n == "e-"][0] is [n for n in names if n == "e-"][1]
+
+    def test_column_reorders_and_widens_ints(self, records):
+        """Test column access with an order and NaN for missing ints."""
+        compact = CompactRecords.from_records(records)
+        three_charge = compact.column("three_charge", order=[1, 0, 2])
+
+        assert three_charge.typecode == "d"
+        assert list(three_charge)[:2] == [-3.0, 3.0]
+        assert math.isnan(three_charge[2])
+
+
+class TestCompactNameMapping:
+    """Tests for the CSR name mapping."""
+
+    def test_round_trip(self):
+        """Test lookups and conversion back to a dict."""
+        mapping = {"electron": [11], "e": [11, -11], "pion": [111, 211, -211]}
+        compact = CompactNameMapping.from_dict(mapping)
+
+        assert len(compact) == 3
+        assert compact.get("pion") == [111, 211, -211]
+        assert compact.get("muon") is None
+        assert "e" in compact and "muon" not in compact
+        assert compact.to_dict() == mapping
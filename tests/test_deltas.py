@@ -0,0 +1,112 @@
+"""Unit tests for content hashes, dataset versions and deltas."""
+
+import json
+
+import generate_data
+from generate_data import (
+    cache_keys,
+    collect_previous_files,
+    compute_delta,
+    dataset_version,
+    hash_dataset,
+    write_deltas,
+)
+
+
+class TestDeltas:
+    """Tests for content hashes and delta manifests."""
+
+    def test_compute_delta(self):
+        """Test that added, changed and removed files are listed."""
+        old = {"11.json": "a", "13.json": "b", "22.json": "c"}
+        new = {"11.json": "a", "13.json": "B", "25.json": "d"}
+
+        assert compute_delta(old, new) == {
+            "added": ["25.json"],
+            "changed": ["13.json"],
+            "removed": ["22.json"],
+        }
+
+    def test_hash_dataset_skips_bookkeeping(self, tmp_path):
+        """Test that manifest, files.json, keys.json and deltas are not hashed."""
+        for relative in [
+            "11.json",
+            "table/mass.f64",
+            "manifest.json",
+            "files.json",
+            "keys.json",
+            "deltas/v1.json",
+        ]:
+            path = tmp_path / relative
+            path.parent.mkdir(exist_ok=True)
+            path.write_text(relative)
+
+        assert sorted(hash_dataset(tmp_path)) == ["11.json", "table/mass.f64"]
+
+    def test_version_follows_content(self):
+        """Test that the version depends only on the file hashes."""
+        files = {"11.json": "a" * 64, "22.json": "b" * 64}
+
+        assert dataset_version(files) == dataset_version(dict(reversed(files.items())))
+        assert dataset_version(files) != dataset_version({**files, "22.json": "c" * 64})
+        assert len(dataset_version(files)) == generate_data.VERSION_LENGTH
+
+    def test_cache_keys_cover_fetched_files(self):
+        """Test that top-level JSON files get a short key of their own hash."""
+        files = {
+            "11.json": "ab" * 32,
+            "popular.json": "cd" * 32,
+            "table/pdgid.i32": "ef" * 32,
+        }
+
+        assert cache_keys(files) == {"11.json": "abababab", "popular.json": "cdcdcdcd"}
+
+    def test_write_deltas(self, tmp_path):
+        """Test that a delta file is written per earlier version."""
+        (tmp_path / "11.json").write_text("electron")
+        (tmp_path / "25.json").write_text("higgs")
+        files = hash_dataset(tmp_path)
+        previous = {
+            "v1": {"11.json": "stale", "22.json": "x"},
+            "v2": dict(files),
+        }
+
+        written = write_deltas(tmp_path, "v3", files, previous)
+
+        assert written == ["v1", "v2"]
+        with open(tmp_path / "deltas" / "v1.json") as f:
+            delta = json.load(f)
+        assert delta == {
+            "from": "v1",
+            "to": "v3",
+            "added": ["25.json"],
+            "changed": ["11.json"],
+            "removed": ["22.json"],
+            "bytes": len("electron") + len("higgs"),
+        }
+        with open(tmp_path / "deltas" / "v2.json") as f:
+            assert json.load(f)["bytes"] == 0
+
+    def test_collect_previous_files(self, tmp_path):
+        """Test that local versions and a published files.json are combined."""
+        local = tmp_path / "particle-data"
+        for name, files in [("v1", None), ("v2", {"11.json": "a"})]:
+            (local / name).mkdir(parents=True)
+            if files is not None:
+                (local / name / "files.json").write_text(json.dumps(files))
+        published = tmp_path / "live"
+        published.mkdir()
+        (published / "files.json").write_text(json.dumps({"11.json": "b"}))
+        (published / "manifest.json").write_text(json.dumps({"version": "v0"}))
+
+        previous = collect_previous_files(
+            [local / "v1", local / "v2"], str(published / "files.json")
+        )
+
+        # v1 predates content hashing; the published version comes last
+        assert list(previous) == ["v2", "v0"]
+        assert previous["v0"] == {"11.json": "b"}
+
+    def test_missing_published_files_are_skipped(self, tmp_path):
+        """Test that an unreachable previous dataset doesn't fail the build."""
+        assert collect_previous_files([], str(tmp_path / "files.json")) == {}
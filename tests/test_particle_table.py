@@ -0,0 +1,123 @@
+"""Unit tests for the columnar particle table and bulk translation."""
+
+import json
+import math
+from array import array
+
+import pytest
+
+import particle_table
+from particle_table import (
+    load_particle_table,
+    translate_pdgids,
+    write_particle_table,
+)
+
+needs_numpy = pytest.mark.skipif(
+    particle_table.np is None, reason="numpy is not installed"
+)
+
+
+def npy_bytes(values, descr="<i4"):
+    """Encode a 1-D little-endian integer array in the .npy v1.0 format."""
+    header = repr(
+        {"descr": descr, "fortran_order": False, "shape": (len(values),)}
+    ).encode("latin1")
+    header += b" " * (-(10 + len(header) + 1) % 64) + b"\n"
+    data = array({"<i4": "i", "<i8": "q"}[descr], values)
+    return (
+        b"\x93NUMPY\x01\x00"
+        + len(header).to_bytes(2, "little")
+        + header
+        + data.tobytes()
+    )
+
+
+@pytest.fixture
+def table_dir(tmp_path, records):
+    """A particle table written from the sample records."""
+    write_particle_table(records, tmp_path)
+    return tmp_path
+
+
+class TestParticleTable:
+    """Tests for writing and loading the columnar particle table."""
+
+    def test_columns_sorted_by_pdgid(self, table_dir):
+        """Test that loaded columns are aligned and sorted by PDG ID."""
+        table = load_particle_table(table_dir)
+
+        assert list(table["pdgid"]) == [-11, 11, 22, 2212]
+        assert table["name"] == ["e+", "e-", "gamma", "p"]
+        assert list(table["mass"]) == pytest.approx([0.511, 0.511, 0.0, 938.27])
+        assert math.isnan(table["width"][0])
+
+    def test_files_are_little_endian(self, table_dir):
+        """Test the on-disk layout described by columns.json."""
+        with open(table_dir / "columns.json") as f:
+            layout = json.load(f)
+
+        assert layout["rows"] == 4
+        assert layout["columns"]["pdgid"] == "<i4"
+        pdgids = array("i", (table_dir / "pdgid.i32").read_bytes())
+        assert list(pdgids) == [-11, 11, 22, 2212]
+
+
+class TestTranslatePdgids:
+    """Tests for bulk PDG ID translation."""
+
+    def check(self, result):
+        assert list(result["found"]) == [True, True, False, True]
+        assert list(result["name"]) == ["p", "e-", None, "gamma"]
+        assert math.isnan(result["mass"][2])
+        assert result["mass"][0] == pytest.approx(938.27)
+
+    @needs_numpy
+    def test_sequence(self, table_dir):
+        """Test translating a list of ints with numpy."""
+        table = load_particle_table(table_dir)
+        self.check(translate_pdgids([2212, 11, 13, 22], ["name", "mass"], table))
+
+    @needs_numpy
+    def test_raw_int32_bytes(self, table_dir):
+        """Test translating raw little-endian int32 bytes."""
+        table = load_particle_table(table_dir)
+        raw = array("i", [2212, 11, 13, 22]).tobytes()
+        self.check(translate_pdgids(raw, ["name", "mass"], table))
+
+    @needs_numpy
+    def test_npy_bytes(self, table_dir):
+        """Test translating NumPy .npy bytes."""
+        table = load_particle_table(table_dir)
+        self.check(
+            translate_pdgids(
+                npy_bytes([2212, 11, 13, 22], "<i8"), ["name", "mass"], table
+            )
+        )
+
+    def test_without_numpy(self, table_dir, monkeypatch):
+        """Test the pure-Python paths, including the minimal .npy reader."""
+        monkeypatch.setattr(particle_table, "np", None)
+        table = load_particle_table(table_dir)
+
+        assert isinstance(table["mass"], array)
+        self.check(translate_pdgids([2212, 11, 13, 22], ["name", "mass"], table))
+        self.check(
+            translate_pdgids(
+                array("i", [2212, 11, 13, 22]).tobytes(), ["name", "mass"], table
+            )
+        )
+        for descr in ["<i4", "<i8"]:
+            self.check(
+                translate_pdgids(
+                    npy_bytes([2212, 11, 13, 22], descr), ["name", "mass"], table
+                )
+            )
+
+    def test_invalid_input(self, table_dir):
+        """Test unknown properties and truncated raw input."""
+        table = load_particle_table(table_dir)
+        with pytest.raises(ValueError, match="Unknown properties"):
+            translate_pdgids([11], ["colour"], table)
+        with pytest.raises(ValueError, match="multiple of 4"):
+            translate_pdgids(b"\x0b\x00\x00", ["name"], table)
@@ -0,0 +1,75 @@
+"""Unit tests for counting popular particles from access logs."""
+
+import gzip
+
+import pytest
+
+import generate_data
+from generate_data import PopularityTracker, load_usage_logs
+
+
+class TestPopularityTracker:
+    """Tests for the exact hit tracker."""
+
+    def test_most_common_orders_by_hits(self):
+        """Test that the heaviest hitters are returned, most hits first."""
+        tracker = PopularityTracker()
+        for pdgid, hits in [(11, 5), (13, 2), (22, 9), (211, 1), (2212, 7)]:
+            for _ in range(hits):
+                tracker.record(pdgid)
+
+        assert tracker.most_common(3) == [(22, 9), (2212, 7), (11, 5)]
+        assert tracker.most_common(1) == [(22, 9)]
+        assert len(tracker.most_common()) == 5
+        assert tracker.total == 24
+
+    def test_ties_broken_by_pdgid(self):
+        """Test that equal counts are ordered by PDG ID."""
+        tracker = PopularityTracker()
+        for pdgid in [13, -11, 11]:
+            tracker.record(pdgid, count=3)
+
+        assert tracker.most_common() == [(-11, 3), (11, 3), (13, 3)]
+
+    @pytest.mark.parametrize("value", ["0", "-3", "many"])
+    def test_popular_count_must_be_positive(self, value):
+        """Test that --popular-count rejects non-positive and non-integer values."""
+        with pytest.raises(SystemExit):
+            generate_data.parse_args(["--popular-count", value])
+
+
+class TestUsageLogs:
+    """Tests for reading particle hits from access logs."""
+
+    def test_counts_fetches_and_skips_prefetches(self, tmp_path):
+        """Test that plain and gzipped logs are read and warm-up prefetches ignored."""
+        plain = tmp_path / "access.log"
+        plain.write_text(
+            'GET /particles/11.json HTTP/1.1" 200\n'
+            'GET /particles/11.json?h=1a2b3c4d&prefetch=1 HTTP/1.1" 200\n'
+            'GET /index.html HTTP/1.1" 200\n'
+        )
+        packed = tmp_path / "access.log.1.gz"
+        with gzip.open(packed, "wt") as f:
+            f.write(
+                'GET /what-the-particle/particles/-13.json?h=1a2b3c4d HTTP/1.1" 200\n'
+            )
+
+        tracker = PopularityTracker()
+        hits = load_usage_logs([plain, packed, tmp_path / "missing.log"], tracker)
+
+        assert hits == 2
+        assert tracker.most_common() == [(-13, 1), (11, 1)]
+
+    def test_counts_visit_beacons(self, tmp_path):
+        """Test that the untagged HEAD sent for a shown prefetched record counts."""
+        log = tmp_path / "access.log"
+        log.write_text(
+            'GET /particles/22.json?h=1a2b3c4d&prefetch=1 HTTP/1.1" 200\n'
+            'HEAD /particles/22.json?h=1a2b3c4d HTTP/1.1" 200\n'
+        )
+
+        tracker = PopularityTracker()
+
+        assert load_usage_logs([log], tracker) == 1
+        assert tracker.most_common() == [(22, 1)]
@@ -0,0 +1,139 @@
+"""Unit tests for writing and publishing dataset versions."""
+
+import pytest
+
+import generate_data
+from generate_data import write_files
+
+
+@pytest.fixture
+def dataset_dirs(tmp_path, monkeypatch):
+    """Point OUTPUT_DIR and VERSIONS_DIR at a temporary tree."""
+    output_dir = tmp_path / "static" / "particles"
+    versions_dir = tmp_path / "particle-data"
+    output_dir.parent.mkdir()
+    versions_dir.mkdir()
+    monkeypatch.setattr(generate_data, "OUTPUT_DIR", output_dir)
+    monkeypatch.setattr(generate_data, "VERSIONS_DIR", versions_dir)
+    return output_dir, versions_dir
+
+
+def make_build(versions_dir, name, files):
+    """Create a build directory holding the given {relative path: content} files."""
+    build_dir = versions_dir / f".{name}.tmp"
+    for relative, content in files.items():
+        path = build_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return build_dir
+
+
+class TestWriteFiles:
+    """Tests for the background file writer."""
+
+    def test_writes_all_files(self, tmp_path):
+        """Test that every queued file is written and counted."""
+        files = [(f"{i}.json", b"{}") for i in range(100)]
+        stats = write_files(iter(files), tmp_path)
+
+        assert stats.items == 100
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+            name for name, _ in files
+        )
+
+    def test_failed_writes_raise(self, tmp_path):
+        """Test that a failed write is reported after the queue is drained."""
+        files = [("11.json", b"{}"), ("missing/13.json", b"{}"), ("22.json", b"{}")]
+        with pytest.raises(OSError, match="1 files"):
+            write_files(iter(files), tmp_path)
+
+        assert (tmp_path / "22.json").exists()
+
+
+class TestPublishing:
+    """Tests for versioned publishing and pruning."""
+
+    def test_publish_repoints_symlink(self, dataset_dirs):
+        """Test that publishing moves the build and swaps the symlink."""
+        output_dir, versions_dir = dataset_dirs
+        first = generate_data.publish_dataset(
+            make_build(versions_dir, "v1", {"11.json": "1"}), "v1"
+        )
+        assert output_dir.is_symlink()
+        assert (output_dir / "11.json").read_text() == "1"
+
+        second = generate_data.publish_dataset(
+            make_build(versions_dir, "v2", {"11.json": "2"}), "v2"
+        )
+        assert (output_dir / "11.json").read_text() == "2"
+        assert output_dir.resolve() == second.resolve()
+        assert first.exists()
+
+    def test_publish_replaces_legacy_directory(self, dataset_dirs):
+        """Test that output from before versioning is moved out of the way."""
+        output_dir, versions_dir = dataset_dirs
+        output_dir.mkdir()
+        (output_dir / "old.json").write_text("old")
+
+        generate_data.publish_dataset(
+            make_build(versions_dir, "v1", {"11.json": "1"}), "v1"
+        )
+
+        assert output_dir.is_symlink()
+        assert not (output_dir / "old.json").exists()
+        assert [p.name for p in versions_dir.iterdir()] == ["v1"]
+
+    def test_prune_keeps_newest_and_current(self, dataset_dirs):
+        """Test that pruning keeps the newest versions and never the current one."""
+        _, versions_dir = dataset_dirs
+        for name in ["v1", "v2", "v3", "v4"]:
+            (versions_dir / name).mkdir()
+        (versions_dir / ".v5.tmp").mkdir()
+
+        generate_data.prune_versions(2, versions_dir / "v1")
+
+        assert [p.name for p in generate_data.published_versions()] == [
+            "v1",
+            "v3",
+            "v4",
+        ]
+        assert (versions_dir / ".v5.tmp").exists()
+
+    def test_prune_keeps_published_version(self, dataset_dirs):
+        """Test that the version OUTPUT_DIR points at survives pruning."""
+        output_dir, versions_dir = dataset_dirs
+        for name in ["v1", "v2", "v3"]:
+            (versions_dir / name).mkdir()
+        # A concurrent build published v1 after this one built v3
+        output_dir.symlink_to(versions_dir / "v1", target_is_directory=True)
+
+        generate_data.prune_versions(1, versions_dir / "v3")
+
+        assert [p.name for p in generate_data.published_versions()] == ["v1", "v3"]
+        assert output_dir.resolve() == (versions_dir / "v1").resolve()
+
+    @pytest.mark.parametrize("value", ["-1", "few"])
+    def test_keep_versions_must_be_non_negative(self, value):
+        """Test that --keep-versions rejects negative and non-integer values."""
+        with pytest.raises(SystemExit):
+            generate_data.parse_args(["--keep-versions", value])
+        assert generate_data.parse_args(["--keep-versions", "0"]).keep_versions == 0
+
+    def test_republishing_same_version_reuses_it(self, dataset_dirs):
+        """Test that a build matching a published version replaces nothing."""
+        output_dir, versions_dir = dataset_dirs
+        generate_data.publish_dataset(
+            make_build(versions_dir, "a", {"11.json": "1"}), "v1"
+        )
+        generate_data.publish_dataset(
+            make_build(versions_dir, "b", {"11.json": "2"}), "v2"
+        )
+
+        rebuild = make_build(versions_dir, "c", {"11.json": "1"})
+        version_dir = generate_data.publish_dataset(rebuild, "v1")
+
+        assert not rebuild.exists()
+        assert output_dir.resolve() == version_dir.resolve()
+        assert (output_dir / "11.json").read_text() == "1"
+        # Republishing makes v1 the newest version again
+        assert [p.name for p in generate_data.published_versions()] == ["v2", "v1"]
@@ -0,0 +1,35 @@
+"""Unit tests for the quantum-number bitset index."""
+
+import base64
+
+from generate_data import build_quantum_index, query_quantum_index
+
+
+class TestQuantumIndex:
+    """Tests for the quantum-number bitset index."""
+
+    def test_bitsets_are_little_endian_base64(self):
+        """Test the encoding of a property bitset over sorted PDG IDs."""
+        index = build_quantum_index([2212, 11, -11, 13])
+
+        assert index["pdgids"] == [-11, 11, 13, 2212]
+        # Bit i stands for pdgids[i]: leptons -11, 11, 13 and the baryon 2212
+        assert base64.b64decode(index["properties"]["is_lepton"]) == bytes([0b0111])
+        assert base64.b64decode(index["properties"]["is_baryon"]) == bytes([0b1000])
+
+    def test_query_intersects_properties(self):
+        """Test compound queries and unknown properties."""
+        index = build_quantum_index([11, -11, 13, 111, 211, -211, 2212, 521])
+
+        assert query_quantum_index(index, ["is_lepton", "is_particle"]) == [11, 13]
+        assert query_quantum_index(index, ["is_meson", "has_bottom"]) == [521]
+        assert query_quantum_index(index, ["is_baryon", "J=1/2"]) == [2212]
+        assert query_quantum_index(index, ["no_such_property"]) == []
+        assert query_quantum_index(index, []) == index["pdgids"]
+
+    def test_nuclei_have_no_digit_keys(self):
+        """Test that nuclear codes are not decoded into n, n_r, n_L digits."""
+        index = build_quantum_index([1000020040])
+
+        assert query_quantum_index(index, ["is_nucleus"]) == [1000020040]
+        assert not any(key.startswith("n=") for key in index["properties"])
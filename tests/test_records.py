@@ -0,0 +1,29 @@
+"""Unit tests for building per-particle records."""
+
+import pytest
+from particle import Particle
+
+import generate_data
+from generate_data import iter_particle_records
+
+
+class TestParticleRecords:
+    """Tests for the chunked, optionally parallel record builder."""
+
+    def test_workers_keep_input_order(self):
+        """Test that a process pool yields the same records as inline building."""
+        particles = [
+            Particle.from_pdgid(pdgid) for pdgid in [2212, 11, -11, 22, 211, 13]
+        ]
+
+        inline = list(iter_particle_records(particles, workers=1, chunk_size=4))
+        pooled = list(iter_particle_records(particles, workers=2, chunk_size=4))
+
+        assert [record["pdgid"] for record in inline] == [2212, 11, -11, 22, 211, 13]
+        assert pooled == inline
+
+    @pytest.mark.parametrize("value", ["0", "-1", "all"])
+    def test_workers_must_be_positive(self, value):
+        """Test that --workers rejects non-positive and non-integer values."""
+        with pytest.raises(SystemExit):
+            generate_data.parse_args(["--workers", value])